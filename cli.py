@@ -8,29 +8,39 @@ Commands:
   fishoil qr <lot_number>             — Generate QR payload
   fishoil demo                        — Run terminal demo
   fishoil --test                      — Emit test receipt
+  fishoil --daemon                    — Serve commands on a Unix socket
 """
 
-import argparse
 import json
+import os
 import sys
 
-from src.core import dual_hash, emit_receipt
-from src.catch import create_catch_receipt
-from src.processing import create_processing_receipt
-from src.testing import create_testing_receipt
-from src.encapsulation import create_encapsulation_receipt
-from src.distribution import create_distribution_receipt, validate_cold_chain
-from src.chain import verify_chain, generate_qr_payload
-from src.fraud import run_all_fraud_checks
+# src.* modules are imported inside the command functions so that
+# `fishoil --help` and argument errors never load the receipt pipeline.
+# argparse is imported in _dispatch, after the --test / qr fast path.
+
+# Socket served by `fishoil --daemon`; other invocations forward to it when present
+DAEMON_SOCKET = os.environ.get(
+    "FISHOIL_SOCK", os.path.join(os.path.expanduser("~"), ".fishoil", "sock")
+)
+
+# Seconds a forwarded command may wait on the daemon before giving up
+DAEMON_TIMEOUT = float(os.environ.get("FISHOIL_SOCK_TIMEOUT", "120"))
+
+# Daemon side: how long a client may take to send its request, and its max size
+DAEMON_REQUEST_TIMEOUT = 10.0
+DAEMON_REQUEST_MAX_BYTES = 1024 * 1024
 
 
 def cmd_test():
     """Emit a test receipt to verify core functions work."""
+    from src.core import dual_hash, dumps_json, emit_receipt
+
     receipt = emit_receipt("test", {
         "message": "FishOilProof test receipt",
         "dual_hash_check": dual_hash(b"test"),
     })
-    print(json.dumps(receipt, indent=2))
+    print(dumps_json(receipt, indent=True))
     return receipt
 
 
@@ -51,12 +61,16 @@ def cmd_ingest(stage: str, data_file: str):
         print(f"Unknown stage: {stage}. Valid: {', '.join(creators.keys())}", file=sys.stderr)
         sys.exit(1)
 
+    from src.core import dumps_json
+
     receipt = creators[stage](data)
-    print(json.dumps(receipt, indent=2))
+    print(dumps_json(receipt, indent=True))
     return receipt
 
 
 def _ingest_catch(data: dict) -> dict:
+    from src.catch import create_catch_receipt
+
     return create_catch_receipt(
         species=data["species"],
         fishery_registry=data["fishery_registry"],
@@ -68,6 +82,8 @@ def _ingest_catch(data: dict) -> dict:
 
 
 def _ingest_processing(data: dict) -> dict:
+    from src.processing import create_processing_receipt
+
     return create_processing_receipt(
         facility_id=data["facility_id"],
         facility_name=data["facility_name"],
@@ -84,6 +100,8 @@ def _ingest_processing(data: dict) -> dict:
 
 
 def _ingest_testing(data: dict) -> dict:
+    from src.testing import create_testing_receipt
+
     return create_testing_receipt(
         lab_name=data["lab_name"],
         lab_cert_type=data["lab_cert_type"],
@@ -103,6 +121,8 @@ def _ingest_testing(data: dict) -> dict:
 
 
 def _ingest_encapsulation(data: dict) -> dict:
+    from src.encapsulation import create_encapsulation_receipt
+
     return create_encapsulation_receipt(
         facility_id=data["facility_id"],
         facility_name=data["facility_name"],
@@ -119,6 +139,8 @@ def _ingest_encapsulation(data: dict) -> dict:
 
 
 def _ingest_distribution(data: dict) -> dict:
+    from src.distribution import create_distribution_receipt, validate_cold_chain
+
     cold_chain = None
     if "cold_chain_temps" in data:
         cold_chain = validate_cold_chain(
@@ -139,13 +161,16 @@ def _ingest_distribution(data: dict) -> dict:
 
 def cmd_verify(lot_number: str):
     """Verify the full chain for a lot number."""
+    from src.core import dumps_json
+    from src.chain import verify_chain
+    from src.fraud import run_all_fraud_checks
+
     result = verify_chain(lot_number)
-    print(json.dumps(result, indent=2, default=str))
+    print(dumps_json(result, indent=True))
 
     if result["chain_valid"]:
         # Also run fraud checks
-        chain = list(result["receipts"].values())
-        anomalies = run_all_fraud_checks(chain)
+        anomalies = run_all_fraud_checks(result["receipts"].values())
         if anomalies:
             print(f"\nFraud checks found {len(anomalies)} anomalies:")
             for a in anomalies:
@@ -155,6 +180,8 @@ def cmd_verify(lot_number: str):
 
 def cmd_qr(lot_number: str):
     """Generate QR payload for a lot number."""
+    from src.chain import generate_qr_payload
+
     payload = generate_qr_payload(lot_number)
     print(payload)
     return payload
@@ -166,35 +193,239 @@ def cmd_demo():
     run_demo()
 
 
+def cmd_daemon(socket_path: str = DAEMON_SOCKET):
+    """Serve CLI commands on a Unix socket with all modules already imported.
+
+    Each connection sends one JSON line {"argv": [...], "cwd": "..."} and
+    receives one JSON line {"stdout": ..., "stderr": ..., "code": ...}.
+    """
+    import threading
+
+    # Pay the import cost once, up front
+    import src.catch, src.processing, src.testing, src.encapsulation  # noqa: F401
+    import src.distribution, src.chain, src.fraud  # noqa: F401
+
+    server = _bind_daemon_socket(socket_path)
+    print(f"fishoil daemon listening on {socket_path}")
+    try:
+        _serve_daemon(server, threading.Event())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(socket_path)
+
+
+def _bind_daemon_socket(socket_path: str):
+    """Create the daemon's listening socket, reachable by the current user only."""
+    import socket
+
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir:
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        # makedirs leaves an existing directory's mode alone; tighten our own
+        # default directory, but never a shared one named via FISHOIL_SOCK
+        if os.path.abspath(socket_dir) == os.path.join(os.path.expanduser("~"), ".fishoil"):
+            os.chmod(socket_dir, 0o700)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # the socket file is created 0600, never wider
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    return server
+
+
+def _serve_daemon(server, stop) -> None:
+    """Accept and answer connections one at a time until stop is set.
+
+    A client that disconnects, stalls past DAEMON_REQUEST_TIMEOUT or sends
+    an oversized request only loses its own connection. To stop from
+    another thread, set stop and shut the server socket down.
+    """
+    while not stop.is_set():
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            if stop.is_set():
+                return
+            continue
+        conn.settimeout(DAEMON_REQUEST_TIMEOUT)
+        try:
+            with conn, conn.makefile("rwb") as stream:
+                line = stream.readline(DAEMON_REQUEST_MAX_BYTES + 1)
+                if len(line) > DAEMON_REQUEST_MAX_BYTES or not line.endswith(b"\n"):
+                    reply = {"stdout": "", "stderr": "Invalid daemon request\n", "code": 2}
+                else:
+                    reply = _serve_daemon_request(line)
+                stream.write(json.dumps(reply).encode("utf-8") + b"\n")
+                stream.flush()
+        except OSError:
+            continue  # client gone or too slow; keep serving the others
+
+
+def _serve_daemon_request(line: bytes) -> dict:
+    """Run one forwarded command in-process, capturing its output."""
+    import contextlib
+    import io
+    import traceback
+
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return {"stdout": "", "stderr": "Invalid daemon request\n", "code": 2}
+    argv = request.get("argv") if isinstance(request, dict) else None
+    if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+        return {"stdout": "", "stderr": "Invalid daemon request\n", "code": 2}
+    if "--daemon" in argv:
+        return {"stdout": "", "stderr": "--daemon cannot be forwarded to a daemon\n", "code": 2}
+
+    home = os.getcwd()
+    try:
+        os.chdir(request.get("cwd", home))
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            _dispatch(argv)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        err.write(traceback.format_exc())
+        code = 1
+    finally:
+        os.chdir(home)
+
+    return {"stdout": out.getvalue(), "stderr": err.getvalue(), "code": code}
+
+
+def _forward_to_daemon(argv: list[str]) -> bool:
+    """Run argv on a running daemon.
+
+    Returns False only if no daemon accepted the connection, so the caller
+    can run the command in-process. Once the request has been sent the
+    daemon may already have run it (an ingest may have appended its
+    receipt), so later failures are reported and exit non-zero instead of
+    re-running the command.
+    """
+    if not os.path.exists(DAEMON_SOCKET):
+        return False
+
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_TIMEOUT)
+        try:
+            sock.connect(DAEMON_SOCKET)
+        except OSError:
+            return False  # stale socket, no daemon listening: run in-process
+
+        try:
+            request = {"argv": argv, "cwd": os.getcwd()}
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                reply = json.loads(stream.readline())
+            stdout, stderr, code = reply["stdout"], reply["stderr"], reply["code"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"fishoil: daemon at {DAEMON_SOCKET} failed after the command was sent "
+                  f"({type(e).__name__}: {e}); it may have run. Not retrying.", file=sys.stderr)
+            sys.exit(1)
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    if code:
+        sys.exit(code)
+    return True
+
+
+COMMANDS = ("ingest", "verify", "qr", "demo")
+
+# Shown under --help when no subcommand was given, so the full set of
+# subparsers does not have to be built just to list them.
+COMMANDS_EPILOG = """commands:
+  ingest <stage> <data_file>  Create receipt for a stage
+  verify <lot_number>         Verify full chain
+  qr <lot_number>             Generate QR payload
+  demo                        Run terminal demo for Jay
+"""
+
+
+def _sniff_subcommand(argv: list[str]) -> str | None:
+    """Return the subcommand named on the command line, if any.
+
+    Args:
+        argv: Full argument vector (argv[0] is the program name).
+
+    Returns:
+        The first non-flag token if it is a known command, else None.
+    """
+    for arg in argv[1:]:
+        if arg.startswith("-"):
+            continue
+        return arg if arg in COMMANDS else None
+    return None
+
+
 def main():
+    if "--daemon" not in sys.argv and _forward_to_daemon(sys.argv):
+        return
+    _dispatch(sys.argv)
+
+
+def _dispatch(argv: list[str]):
+    """Parse argv and run the selected command in this process."""
+    # Fast path for the scripted commands: no parser for exact simple forms
+    if len(argv) == 2 and argv[1] == "--test":
+        cmd_test()
+        return
+    if len(argv) == 3 and argv[1] == "qr" and not argv[2].startswith("-"):
+        cmd_qr(argv[2])
+        return
+
+    import argparse
+
+    command = _sniff_subcommand(argv)
+
     parser = argparse.ArgumentParser(
         prog="fishoil",
         description="FishOilProof — Supply chain telemetry with receipts-native fraud detection",
+        epilog=None if command else COMMANDS_EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
     parser.add_argument("--test", action="store_true", help="Emit a test receipt")
+    parser.add_argument("--daemon", action="store_true",
+                        help=f"Serve commands on a Unix socket ({DAEMON_SOCKET})")
+    parser.set_defaults(command=None)
 
-    subparsers = parser.add_subparsers(dest="command")
+    # Only the subparser actually named on the command line is built
+    if command:
+        subparsers = parser.add_subparsers(dest="command")
 
-    # ingest
-    ingest_parser = subparsers.add_parser("ingest", help="Create receipt for a stage")
-    ingest_parser.add_argument("stage", choices=["catch", "processing", "testing", "encapsulation", "distribution"])
-    ingest_parser.add_argument("data_file", help="Path to JSON data file")
+        if command == "ingest":
+            ingest_parser = subparsers.add_parser("ingest", help="Create receipt for a stage")
+            ingest_parser.add_argument("stage", choices=["catch", "processing", "testing", "encapsulation", "distribution"])
+            ingest_parser.add_argument("data_file", help="Path to JSON data file")
 
-    # verify
-    verify_parser = subparsers.add_parser("verify", help="Verify full chain")
-    verify_parser.add_argument("lot_number", help="Lot number to verify")
+        elif command == "verify":
+            verify_parser = subparsers.add_parser("verify", help="Verify full chain")
+            verify_parser.add_argument("lot_number", help="Lot number to verify")
 
-    # qr
-    qr_parser = subparsers.add_parser("qr", help="Generate QR payload")
-    qr_parser.add_argument("lot_number", help="Lot number")
+        elif command == "qr":
+            qr_parser = subparsers.add_parser("qr", help="Generate QR payload")
+            qr_parser.add_argument("lot_number", help="Lot number")
 
-    # demo
-    subparsers.add_parser("demo", help="Run terminal demo for Jay")
+        elif command == "demo":
+            subparsers.add_parser("demo", help="Run terminal demo for Jay")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv[1:])
 
-    if args.test:
+    if args.daemon:
+        cmd_daemon()
+    elif args.test:
         cmd_test()
     elif args.command == "ingest":
         cmd_ingest(args.stage, args.data_file)
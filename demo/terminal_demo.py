@@ -13,7 +13,7 @@ import tempfile
 # Ensure project root is on path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from src.core import dual_hash
+from src.core import dual_hash_many, flush_ledger
 from src.catch import create_catch_receipt
 from src.processing import create_processing_receipt
 from src.testing import create_testing_receipt
@@ -25,25 +25,64 @@ from src.fraud import run_all_fraud_checks
 
 def _short_hash(h: str) -> str:
     """Abbreviate a dual hash for display."""
-    if ":" in h:
-        parts = h.split(":")
-        sha_part = parts[0][:12]
-        blake_part = parts[1][:12]
-        return f"{sha_part}:{blake_part}..."
+    sha_part, sep, blake_part = h.partition(":")
+    if sep:
+        return f"{sha_part[:12]}:{blake_part[:12]}..."
     return h[:24] + "..."
 
 
-def run_demo():
-    """Execute the full terminal demo."""
-    # Use a temp ledger for demo
-    demo_ledger = tempfile.mktemp(suffix=".jsonl")
+def _short_root(root: str | None) -> str:
+    """Abbreviate a Merkle root for display (None when FISHOIL_MERKLE=0)."""
+    return f"{root[:24]}..." if root else "(disabled)"
 
-    print()
 
-    # === STAGE 1: CATCH ===
-    import_docs_hash = dual_hash(b"peru_import_docs_2025.pdf")
-    fishery_cert_hash = dual_hash(b"msc_chain_of_custody_cert_12345.pdf")
+def _flush(lines: list[str]) -> None:
+    """Write buffered demo lines to stdout in one call and clear the buffer."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        lines.clear()
+
+
+def run_demo():
+    """Execute the full terminal demo against a throwaway ledger."""
+    with tempfile.TemporaryDirectory(prefix="fishoil_demo_") as tmp:
+        demo_ledger = os.path.join(tmp, "demo.jsonl")
+        try:
+            return _run_demo(demo_ledger)
+        finally:
+            flush_ledger(demo_ledger)
+
+
+def _run_demo(demo_ledger: str) -> dict:
+    """Run the 5 stages, verification and fraud checks on demo_ledger.
+
+    Output is buffered per stage and written with a single call per stage
+    instead of one print per line.
+    """
+    out: list[str] = []
+    emit = out.append
+
+    # Document hashes for every stage, computed up front in one batch
+    (
+        import_docs_hash,
+        fishery_cert_hash,
+        gmp_cert_hash,
+        lab_cert_hash,
+        facility_cert_hash,
+        temp_log_hash,
+    ) = dual_hash_many([
+        b"peru_import_docs_2025.pdf",
+        b"msc_chain_of_custody_cert_12345.pdf",
+        b"omega_protein_gmp_cert_2025.pdf",
+        b"eurofins_iso17025_cert.pdf",
+        b"nsf_gmp_bottling_cert_4567.pdf",
+        b"whole_foods_temp_log_iot_data.csv",
+    ])
+
+    emit("")
 
+    # === STAGE 1: CATCH ===
     catch = create_catch_receipt(
         species="Engraulis ringens",
         fishery_registry="PRODUCE Peru",
@@ -54,20 +93,19 @@ def run_demo():
         ledger_path=demo_ledger,
     )
 
-    print("[CATCH RECEIPT]")
-    print(f"Species: {catch['species_common']} ({catch['species']})")
-    print(f"Fishery: Approved ({catch['fishery_registry']} Registry)")
-    print(f"Import Docs: {_short_hash(catch['import_docs_hash'])}")
-    print(f"\u2713 MSC Chain-of-Custody: Certificate #{catch['fishery_cert_id']}")
-    print(f"  Hash: {_short_hash(catch['fishery_cert_hash'])}")
-    print(f"  ")
-    print(f"Receipt Hash: {_short_hash(catch['payload_hash'])}")
-    print(f"Merkle Root: {catch['merkle_root'][:24]}...")
-    print()
+    emit("[CATCH RECEIPT]")
+    emit(f"Species: {catch['species_common']} ({catch['species']})")
+    emit(f"Fishery: Approved ({catch['fishery_registry']} Registry)")
+    emit(f"Import Docs: {_short_hash(catch['import_docs_hash'])}")
+    emit(f"\u2713 MSC Chain-of-Custody: Certificate #{catch['fishery_cert_id']}")
+    emit(f"  Hash: {_short_hash(catch['fishery_cert_hash'])}")
+    emit(f"  ")
+    emit(f"Receipt Hash: {_short_hash(catch['payload_hash'])}")
+    emit(f"Merkle Root: {_short_root(catch['merkle_root'])}")
+    emit("")
+    _flush(out)
 
     # === STAGE 2: PROCESSING ===
-    gmp_cert_hash = dual_hash(b"omega_protein_gmp_cert_2025.pdf")
-
     processing = create_processing_receipt(
         facility_id="OP-HOUSTON-01",
         facility_name="Omega Protein Corp",
@@ -85,22 +123,21 @@ def run_demo():
 
     yield_pct = processing["yield_ratio"] * 100
 
-    print("[PROCESSING RECEIPT]")
-    print(f"Facility: {processing['facility_name']} (GMP-certified)")
-    print(f"GMP Cert Hash: {_short_hash(processing['gmp_cert_hash'])}")
-    print(f"Batch: {processing['batch_id']}")
-    print(f"Method: Molecular distillation")
-    print(f"\u2713 Yield Reconciliation: {processing['yield_input_kg']:.0f}kg fish \u2192 {processing['yield_output_kg']:.0f}kg oil ({yield_pct:.1f}%)")
-    print(f"  Expected: 12-18% (PASS)")
-    print(f"  ")
-    print(f"Previous Hash: {_short_hash(processing['previous_hash'])} \u2713")
-    print(f"Receipt Hash: {_short_hash(processing['payload_hash'])}")
-    print(f"Merkle Root: {processing['merkle_root'][:24]}...")
-    print()
+    emit("[PROCESSING RECEIPT]")
+    emit(f"Facility: {processing['facility_name']} (GMP-certified)")
+    emit(f"GMP Cert Hash: {_short_hash(processing['gmp_cert_hash'])}")
+    emit(f"Batch: {processing['batch_id']}")
+    emit(f"Method: Molecular distillation")
+    emit(f"\u2713 Yield Reconciliation: {processing['yield_input_kg']:.0f}kg fish \u2192 {processing['yield_output_kg']:.0f}kg oil ({yield_pct:.1f}%)")
+    emit(f"  Expected: 12-18% (PASS)")
+    emit(f"  ")
+    emit(f"Previous Hash: {_short_hash(processing['previous_hash'])} \u2713")
+    emit(f"Receipt Hash: {_short_hash(processing['payload_hash'])}")
+    emit(f"Merkle Root: {_short_root(processing['merkle_root'])}")
+    emit("")
+    _flush(out)
 
     # === STAGE 3: TESTING ===
-    lab_cert_hash = dual_hash(b"eurofins_iso17025_cert.pdf")
-
     testing = create_testing_receipt(
         lab_name="Eurofins",
         lab_cert_type="ISO17025",
@@ -121,21 +158,20 @@ def run_demo():
 
     totox = testing["oxidation"]["totox"]
 
-    print("[TESTING RECEIPT]")
-    print(f"Lab: {testing['lab_name']} (ISO 17025)")
-    print(f"Mercury: {testing['contaminants']['mercury_ppm']} ppm (limit: 0.1) \u2713")
-    print(f"PCBs: {testing['contaminants']['pcbs_ppm']} ppm (limit: 0.09) \u2713")
-    print(f"EPA/DHA: {testing['potency']['total_omega3_mg']:.0f}mg (label: {testing['potency']['label_claim_mg']:.0f}mg) \u2713")
-    print(f"TOTOX: {totox} (limit: 26) \u2713")
-    print()
-    print(f"Previous Hash: {_short_hash(testing['previous_hash'])} \u2713")
-    print(f"Receipt Hash: {_short_hash(testing['payload_hash'])}")
-    print(f"Merkle Root: {testing['merkle_root'][:24]}...")
-    print()
+    emit("[TESTING RECEIPT]")
+    emit(f"Lab: {testing['lab_name']} (ISO 17025)")
+    emit(f"Mercury: {testing['contaminants']['mercury_ppm']} ppm (limit: 0.1) \u2713")
+    emit(f"PCBs: {testing['contaminants']['pcbs_ppm']} ppm (limit: 0.09) \u2713")
+    emit(f"EPA/DHA: {testing['potency']['total_omega3_mg']:.0f}mg (label: {testing['potency']['label_claim_mg']:.0f}mg) \u2713")
+    emit(f"TOTOX: {totox} (limit: 26) \u2713")
+    emit("")
+    emit(f"Previous Hash: {_short_hash(testing['previous_hash'])} \u2713")
+    emit(f"Receipt Hash: {_short_hash(testing['payload_hash'])}")
+    emit(f"Merkle Root: {_short_root(testing['merkle_root'])}")
+    emit("")
+    _flush(out)
 
     # === STAGE 4: ENCAPSULATION ===
-    facility_cert_hash = dual_hash(b"nsf_gmp_bottling_cert_4567.pdf")
-
     encap = create_encapsulation_receipt(
         facility_id="NSF-BOTTLE-01",
         facility_name="NSF-certified Bottling",
@@ -151,19 +187,19 @@ def run_demo():
         ledger_path=demo_ledger,
     )
 
-    print("[ENCAPSULATION RECEIPT]")
-    print(f"Facility: NSF-certified (Cert #{encap['facility_cert_id']})")
-    print(f"Lot: {encap['lot_number']}")
-    print(f"Fill Date: {encap['fill_date']}")
-    print()
-    print(f"Previous Hash: {_short_hash(encap['previous_hash'])} \u2713")
-    print(f"Receipt Hash: {_short_hash(encap['payload_hash'])}")
-    print(f"Merkle Root: {encap['merkle_root'][:24]}...")
-    print()
+    emit("[ENCAPSULATION RECEIPT]")
+    emit(f"Facility: NSF-certified (Cert #{encap['facility_cert_id']})")
+    emit(f"Lot: {encap['lot_number']}")
+    emit(f"Fill Date: {encap['fill_date']}")
+    emit("")
+    emit(f"Previous Hash: {_short_hash(encap['previous_hash'])} \u2713")
+    emit(f"Receipt Hash: {_short_hash(encap['payload_hash'])}")
+    emit(f"Merkle Root: {_short_root(encap['merkle_root'])}")
+    emit("")
+    _flush(out)
 
     # === STAGE 5: DISTRIBUTION ===
     temp_readings = [2.1, 2.3, 2.0, 2.2, 2.1, 2.4, 2.0, 1.9, 2.1, 2.3]
-    temp_log_hash = dual_hash(b"whole_foods_temp_log_iot_data.csv")
     cold_chain = validate_cold_chain(temp_readings, duration_days=147, temp_log_hash=temp_log_hash)
 
     dist = create_distribution_receipt(
@@ -177,50 +213,45 @@ def run_demo():
         ledger_path=demo_ledger,
     )
 
-    print("[DISTRIBUTION RECEIPT]")
-    print(f"Distributor: {dist['distributor_name']}")
-    print(f"Warehouse: {dist['warehouse_id']}")
-    print(f"\u2713 Cold Chain: {cold_chain['avg_temp_c']}\u00b0C average ({cold_chain['duration_days']} days)")
-    print(f"  Temp Log Hash: {_short_hash(cold_chain['temp_log_hash'])}")
-    print(f"  Deviations: {cold_chain['deviations_count']}")
-    print(f"  ")
-    print(f"Previous Hash: {_short_hash(dist['previous_hash'])} \u2713")
-    print(f"Receipt Hash: {_short_hash(dist['payload_hash'])}")
-    print(f"Merkle Root: {dist['merkle_root'][:24]}...")
-    print()
+    emit("[DISTRIBUTION RECEIPT]")
+    emit(f"Distributor: {dist['distributor_name']}")
+    emit(f"Warehouse: {dist['warehouse_id']}")
+    emit(f"\u2713 Cold Chain: {cold_chain['avg_temp_c']}\u00b0C average ({cold_chain['duration_days']} days)")
+    emit(f"  Temp Log Hash: {_short_hash(cold_chain['temp_log_hash'])}")
+    emit(f"  Deviations: {cold_chain['deviations_count']}")
+    emit(f"  ")
+    emit(f"Previous Hash: {_short_hash(dist['previous_hash'])} \u2713")
+    emit(f"Receipt Hash: {_short_hash(dist['payload_hash'])}")
+    emit(f"Merkle Root: {_short_root(dist['merkle_root'])}")
+    emit("")
+    _flush(out)
 
     # === QR CODE VERIFICATION ===
     chain_result = verify_chain("LOT-2025-0131-BP", ledger_path=demo_ledger)
     summary = get_chain_summary("LOT-2025-0131-BP", ledger_path=demo_ledger)
 
-    print("[QR CODE VERIFICATION]")
-    print(f"Scanning: LOT-2025-0131-BP")
-    print(f"Chain: {chain_result['chain_length']} receipts \u2713")
-    print(f"\u2713 Fishery certified (MSC verified)")
-    print(f"\u2713 Yield normal (no dilution detected)")
-    print(f"\u2713 Contaminants pass (all limits)")
-    print(f"\u2713 Potency verified ({testing['potency']['total_omega3_mg']:.0f}mg vs {testing['potency']['label_claim_mg']:.0f}mg label)")
-    print(f"\u2713 Cold chain maintained (no oxidation risk)")
-    print()
+    emit("[QR CODE VERIFICATION]")
+    emit(f"Scanning: LOT-2025-0131-BP")
+    emit(f"Chain: {chain_result['chain_length']} receipts \u2713")
+    emit(f"\u2713 Fishery certified (MSC verified)")
+    emit(f"\u2713 Yield normal (no dilution detected)")
+    emit(f"\u2713 Contaminants pass (all limits)")
+    emit(f"\u2713 Potency verified ({testing['potency']['total_omega3_mg']:.0f}mg vs {testing['potency']['label_claim_mg']:.0f}mg label)")
+    emit(f"\u2713 Cold chain maintained (no oxidation risk)")
+    emit("")
 
     # Run fraud checks
-    chain_receipts = list(chain_result["receipts"].values())
-    anomalies = run_all_fraud_checks(chain_receipts, ledger_path=demo_ledger)
+    anomalies = run_all_fraud_checks(chain_result["receipts"].values(), ledger_path=demo_ledger)
 
     if anomalies:
-        print(f"FRAUD ALERTS: {len(anomalies)} anomalies detected")
+        emit(f"FRAUD ALERTS: {len(anomalies)} anomalies detected")
         for a in anomalies:
-            print(f"  ! {a['anomaly_type']}: {a.get('details', {}).get('message', '')}")
+            emit(f"  ! {a['anomaly_type']}: {a.get('details', {}).get('message', '')}")
     else:
-        print("VERIFICATION COMPLETE: All receipts valid")
-
-    print()
+        emit("VERIFICATION COMPLETE: All receipts valid")
 
-    # Cleanup temp ledger
-    try:
-        os.unlink(demo_ledger)
-    except OSError:
-        pass
+    emit("")
+    _flush(out)
 
     return chain_result
 
@@ -13,56 +13,77 @@ Tools:
 """
 
 import argparse
+import copy
 import json
+import os
 import sys
+from collections import OrderedDict
 
-from src.core import load_ledger
-from src.chain import verify_chain, get_chain_summary, generate_qr_payload
+from src.core import LEDGER_PATH, dumps_json, load_ledger_filtered
+from src.chain import verify_chain, summarize_chain, build_qr_payload
 from src.fraud import run_all_fraud_checks
 
+# Verified chains keyed by (lot_number, ledger_path, ledger inode, mtime_ns,
+# ctime_ns, size). Appends, replacement and in-place rewrites (which also
+# bump ctime) all change the key, so stale results are not served.
+_CHAIN_CACHE: OrderedDict[tuple, dict] = OrderedDict()
+_CHAIN_CACHE_MAX = 128
+
+
+def _cached_verify(lot_number: str, ledger_path: str | None = None) -> dict:
+    """Return verify_chain's result, reusing it while the ledger is unchanged.
+
+    Callers get their own deep copy, so mutating it never affects the cache.
+    """
+    target = ledger_path or LEDGER_PATH
+    try:
+        st = os.stat(target)
+        key = (lot_number, target, st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+    except OSError:
+        key = (lot_number, target, None, None, None, None)
+
+    cached = _CHAIN_CACHE.get(key)
+    if cached is not None:
+        _CHAIN_CACHE.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    result = verify_chain(lot_number, ledger_path=ledger_path)
+    _CHAIN_CACHE[key] = result
+    if len(_CHAIN_CACHE) > _CHAIN_CACHE_MAX:
+        _CHAIN_CACHE.popitem(last=False)
+    return copy.deepcopy(result)
+
 
 def tool_query_receipts(receipt_type: str | None = None,
                         lot_number: str | None = None,
                         batch_id: str | None = None) -> list[dict]:
     """Query receipts from the ledger with optional filters."""
-    receipts = load_ledger()
-
-    results = []
-    for r in receipts:
-        if receipt_type and r.get("receipt_type") != receipt_type:
-            continue
-        if lot_number and r.get("lot_number") != lot_number:
-            continue
-        if batch_id and r.get("batch_id") != batch_id:
-            continue
-        results.append(r)
-
-    return results
+    return load_ledger_filtered(receipt_type=receipt_type, lot_number=lot_number,
+                                batch_id=batch_id)
 
 
 def tool_verify_chain(lot_number: str) -> dict:
     """Verify the full receipt chain for a lot number."""
-    return verify_chain(lot_number)
+    return _cached_verify(lot_number)
 
 
 def tool_get_summary(lot_number: str) -> dict:
     """Get a consumer-friendly chain summary."""
-    return get_chain_summary(lot_number)
+    return summarize_chain(_cached_verify(lot_number))
 
 
 def tool_generate_qr(lot_number: str) -> str:
     """Generate QR payload JSON for a lot number."""
-    return generate_qr_payload(lot_number)
+    return build_qr_payload(summarize_chain(_cached_verify(lot_number)))
 
 
 def tool_run_fraud_checks(lot_number: str) -> list[dict]:
     """Run fraud detection algorithms on a lot's receipt chain."""
-    chain_result = verify_chain(lot_number)
+    chain_result = _cached_verify(lot_number)
     if not chain_result.get("receipts"):
         return [{"error": f"No receipts found for lot {lot_number}"}]
 
-    chain = list(chain_result["receipts"].values())
-    return run_all_fraud_checks(chain)
+    return run_all_fraud_checks(chain_result["receipts"].values())
 
 
 # MCP tool definitions for Claude Desktop
@@ -147,13 +168,17 @@ MCP_TOOLS = [
     },
 ]
 
+# MCP_TOOLS is static: build the tools/list response and --list-tools text once
+_MCP_TOOLS_RESPONSE = {"tools": MCP_TOOLS}
+_MCP_TOOLS_JSON = json.dumps(MCP_TOOLS, indent=2)
+
 
 def handle_mcp_request(request: dict) -> dict:
     """Handle an MCP JSON-RPC request."""
     method = request.get("method", "")
 
     if method == "tools/list":
-        return {"tools": MCP_TOOLS}
+        return _MCP_TOOLS_RESPONSE
 
     elif method == "tools/call":
         params = request.get("params", {})
@@ -173,7 +198,7 @@ def handle_mcp_request(request: dict) -> dict:
 
         try:
             result = handlers[tool_name](**arguments)
-            return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}]}
+            return {"content": [{"type": "text", "text": dumps_json(result, indent=True)}]}
         except Exception as e:
             return {"error": str(e)}
 
@@ -201,6 +226,58 @@ def health_check() -> bool:
     return True
 
 
+# Max bytes taken from stdin per read in stdio mode
+STDIO_READ_CHUNK = 64 * 1024
+
+
+def _handle_line(line: bytes) -> str:
+    """Answer one JSON-RPC line with its serialized response.
+
+    Never raises: a bad request gets an error response of its own, so it
+    cannot take down the other requests batched with it.
+    """
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return dumps_json({"error": "Invalid JSON"})
+    if not isinstance(request, dict):
+        return dumps_json({"error": "Invalid request: expected a JSON object"})
+    try:
+        return dumps_json(handle_mcp_request(request))
+    except Exception as e:
+        return dumps_json({"error": str(e)})
+
+
+def _serve_stdio(instream, outstream) -> None:
+    """Serve newline-delimited JSON-RPC over binary streams.
+
+    Each read1() returns whatever the client has already sent (up to
+    STDIO_READ_CHUNK). Every complete request in it is answered in order,
+    each failing on its own, and the responses go out in one write and one
+    flush before the next read blocks.
+
+    Args:
+        instream: Binary input stream with read1() (sys.stdin.buffer).
+        outstream: Binary output stream (sys.stdout.buffer).
+    """
+    pending = b""
+    while True:
+        chunk = instream.read1(STDIO_READ_CHUNK)
+        if not chunk:
+            lines, pending = [pending], b""
+        else:
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+
+        responses = [_handle_line(line) for line in map(bytes.strip, lines) if line]
+        if responses:
+            outstream.write(("\n".join(responses) + "\n").encode("utf-8"))
+            outstream.flush()
+
+        if not chunk:
+            return
+
+
 def main():
     parser = argparse.ArgumentParser(description="FishOilProof MCP Server")
     parser.add_argument("--health-check", action="store_true", help="Run health check")
@@ -214,22 +291,11 @@ def main():
         sys.exit(0 if success else 1)
 
     elif args.list_tools:
-        print(json.dumps(MCP_TOOLS, indent=2))
+        print(_MCP_TOOLS_JSON)
 
     elif args.stdio:
         # Read JSON-RPC requests from stdin
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                request = json.loads(line)
-                response = handle_mcp_request(request)
-                print(json.dumps(response, default=str))
-                sys.stdout.flush()
-            except json.JSONDecodeError:
-                print(json.dumps({"error": "Invalid JSON"}))
-                sys.stdout.flush()
+        _serve_stdio(sys.stdin.buffer, sys.stdout.buffer)
     else:
         parser.print_help()
 
@@ -8,6 +8,7 @@
 5. CHAIN_INTEGRITY — Chain verification catches tampering
 """
 
+import multiprocessing as mp
 import os
 import sys
 
@@ -69,14 +70,35 @@ ALL_SCENARIOS = [
 ]
 
 
-def run_all() -> bool:
-    """Run all 5 mandatory scenarios and return True if all pass."""
-    all_pass = True
+def _run_one(scenario_fn) -> SimResult:
+    """Pool worker: build one scenario's config and run its cycles in-process."""
+    return run_scenario(scenario_fn(), processes=1)
+
+
+def run_all(processes: int | None = None) -> bool:
+    """Run all 5 mandatory scenarios and return True if all pass.
+
+    Scenarios are independent (own seeds, own ledgers), so they run in a
+    spawn-based process pool. Each cycle is seeded from its config, so
+    results are identical to a serial run.
 
-    for scenario_fn in ALL_SCENARIOS:
-        config = scenario_fn()
-        result = run_scenario(config)
+    Args:
+        processes: Worker count. Defaults to min(len(ALL_SCENARIOS),
+            cpu_count()). 1 runs the scenarios one at a time in-process.
+            Cycles always run in-process, so pools are never nested.
+    """
+    if processes is None:
+        processes = min(len(ALL_SCENARIOS), os.cpu_count() or 1)
+
+    if processes <= 1:
+        results = [run_scenario(fn(), processes=1) for fn in ALL_SCENARIOS]
+    else:
+        with mp.get_context("spawn").Pool(processes=processes) as pool:
+            results = pool.map(_run_one, ALL_SCENARIOS)
+
+    all_pass = True
 
+    for result in results:
         passed = result.failures == 0 and result.false_negatives == 0
         status = "PASS" if passed else "FAIL"
 
@@ -5,6 +5,8 @@ Runs configurable scenarios against the FishOilProof pipeline.
 Each cycle creates a full receipt chain and validates outcomes.
 """
 
+import functools
+import multiprocessing as mp
 import os
 import sys
 import random
@@ -13,7 +15,7 @@ from dataclasses import dataclass, field
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from src.core import dual_hash, StopRule
+from src.core import dual_hash_uncached, flush_ledger, StopRule
 from src.catch import create_catch_receipt
 from src.processing import create_processing_receipt
 from src.testing import create_testing_receipt
@@ -53,40 +55,134 @@ class SimResult:
 
 def _make_fake_hash(label: str) -> str:
     """Generate a deterministic fake dual-hash for simulation."""
-    return dual_hash(label.encode())
+    return dual_hash_uncached(label.encode())
+
+
+# RAM-backed directory for per-cycle ledgers when available (Linux); else default temp dir
+_TMPFS_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+# Fake certificate/document labels hashed for every cycle, keyed by stage field
+DOC_HASH_LABELS = ("import", "msc", "gmp", "lab", "bottle")
+
+
+def _batch_id(config: SimConfig, cycle_num: int) -> str:
+    return f"SIM-{config.name}-{cycle_num:04d}"
+
+
+def precompute_doc_hashes(config: SimConfig) -> list[dict]:
+    """Hash every cycle's fake documents in one pass before the cycle loop.
+
+    Args:
+        config: Simulation configuration.
+
+    Returns:
+        List indexed by cycle number of {label: dual_hash} dicts.
+    """
+    # Every label is unique to its cycle, so caching would only evict real entries
+    hashes = [
+        dual_hash_uncached(f"{label}_{_batch_id(config, i)}".encode())
+        for i in range(config.n_cycles)
+        for label in DOC_HASH_LABELS
+    ]
+    n = len(DOC_HASH_LABELS)
+    return [dict(zip(DOC_HASH_LABELS, hashes[i * n:(i + 1) * n])) for i in range(config.n_cycles)]
+
+
+def make_stage_factories() -> dict:
+    """Bind the fixed simulation fields of each stage constructor once.
+
+    Species, facility identities and the per-stage constants are identical
+    for every cycle of a scenario, so they are baked into partials up front
+    and the cycle loop only supplies the per-cycle and stochastic fields.
+
+    Returns:
+        Dict of stage name -> functools.partial of the receipt constructor.
+    """
+    return {
+        "catch": functools.partial(
+            create_catch_receipt,
+            species="Engraulis ringens",
+            fishery_registry="PRODUCE Peru",
+            fishery_cert_type="MSC",
+        ),
+        "processing": functools.partial(
+            create_processing_receipt,
+            facility_id="SIM-FAC-01",
+            facility_name="Simulation Facility",
+            gmp_cert_type="NSF",
+            extraction_method="MolecularDistillation",
+            extraction_temp_c=240.0,
+        ),
+        "testing": functools.partial(
+            create_testing_receipt,
+            lab_name="Sim Lab",
+            lab_cert_type="ISO17025",
+            label_claim_mg=700.0,
+        ),
+        "encapsulation": functools.partial(
+            create_encapsulation_receipt,
+            facility_id="SIM-BOTTLE-01",
+            facility_name="Sim Bottling",
+            facility_cert_type="NSF",
+            fill_date="2025-01-31T12:00:00Z",
+            capsule_count=90,
+            mg_per_capsule=1000.0,
+        ),
+        "distribution": functools.partial(
+            create_distribution_receipt,
+            distributor_id="SIM-DIST-01",
+            distributor_name="Sim Distribution",
+            warehouse_id="SIM-WH-01",
+            warehouse_location="Simulation City",
+        ),
+    }
 
 
 def run_single_cycle(
     config: SimConfig,
     cycle_num: int,
     ledger_path: str,
+    stages: dict | None = None,
+    doc_hashes: dict | None = None,
 ) -> dict:
     """Run a single simulation cycle through all 5 stages.
 
+    Args:
+        config: Simulation configuration.
+        cycle_num: Cycle index (seeds the per-cycle RNG).
+        ledger_path: Ledger file for this cycle.
+        stages: Stage factories from make_stage_factories(). Built on
+            demand when omitted.
+        doc_hashes: This cycle's entry from precompute_doc_hashes().
+            Hashed on demand when omitted.
+
     Returns dict with cycle results including receipts and anomalies.
     """
-    rng = random.Random(config.random_seed + cycle_num)
+    if stages is None:
+        stages = make_stage_factories()
+    # random.Random over numpy: ~17 draws per cycle, where generator setup dominates
+    uniform = random.Random(config.random_seed + cycle_num).uniform
 
     result = {
         "cycle": cycle_num,
         "receipts": {},
         "anomalies": [],
+        "anomaly_types": [],
         "chain_valid": False,
         "errors": [],
     }
 
-    batch_id = f"SIM-{config.name}-{cycle_num:04d}"
+    batch_id = _batch_id(config, cycle_num)
+    if doc_hashes is None:
+        doc_hashes = {label: _make_fake_hash(f"{label}_{batch_id}") for label in DOC_HASH_LABELS}
     lot_number = f"LOT-SIM-{cycle_num:04d}-{config.name[:2].upper()}"
 
     try:
         # Stage 1: Catch
-        catch = create_catch_receipt(
-            species="Engraulis ringens",
-            fishery_registry="PRODUCE Peru",
-            import_docs_hash=_make_fake_hash(f"import_{batch_id}"),
-            fishery_cert_type="MSC",
+        catch = stages["catch"](
+            import_docs_hash=doc_hashes["import"],
             fishery_cert_id=f"MSC-SIM-{cycle_num}",
-            fishery_cert_hash=_make_fake_hash(f"msc_{batch_id}"),
+            fishery_cert_hash=doc_hashes["msc"],
             ledger_path=ledger_path,
         )
         result["receipts"]["catch"] = catch
@@ -96,17 +192,12 @@ def run_single_cycle(
         if config.yield_override is not None:
             yield_output = yield_input * config.yield_override
         else:
-            yield_output = yield_input * rng.uniform(0.13, 0.17)  # normal range
+            yield_output = yield_input * uniform(0.13, 0.17)  # normal range
 
-        processing = create_processing_receipt(
-            facility_id="SIM-FAC-01",
-            facility_name="Simulation Facility",
-            gmp_cert_type="NSF",
+        processing = stages["processing"](
             gmp_cert_id=f"NSF-SIM-{cycle_num}",
-            gmp_cert_hash=_make_fake_hash(f"gmp_{batch_id}"),
+            gmp_cert_hash=doc_hashes["gmp"],
             batch_id=batch_id,
-            extraction_method="MolecularDistillation",
-            extraction_temp_c=240.0,
             yield_input_kg=yield_input,
             yield_output_kg=round(yield_output, 2),
             previous_hash=catch["payload_hash"],
@@ -119,40 +210,31 @@ def run_single_cycle(
             epa = config.actual_potency_override * 0.583  # typical EPA/DHA ratio
             dha = config.actual_potency_override * 0.417
         else:
-            epa = rng.uniform(380, 450)
-            dha = rng.uniform(270, 320)
+            epa = uniform(380, 450)
+            dha = uniform(270, 320)
 
-        testing = create_testing_receipt(
-            lab_name="Sim Lab",
-            lab_cert_type="ISO17025",
+        testing = stages["testing"](
             lab_cert_id=f"ISO-SIM-{cycle_num}",
-            lab_cert_hash=_make_fake_hash(f"lab_{batch_id}"),
+            lab_cert_hash=doc_hashes["lab"],
             batch_id=batch_id,
-            mercury_ppm=rng.uniform(0.01, 0.05),
-            pcbs_ppm=rng.uniform(0.01, 0.05),
-            dioxins_pg_per_g=rng.uniform(0.5, 2.0),
+            mercury_ppm=uniform(0.01, 0.05),
+            pcbs_ppm=uniform(0.01, 0.05),
+            dioxins_pg_per_g=uniform(0.5, 2.0),
             epa_mg=round(epa, 1),
             dha_mg=round(dha, 1),
-            label_claim_mg=700.0,
-            peroxide_meq_per_kg=rng.uniform(2.0, 4.5),
-            anisidine=rng.uniform(8.0, 15.0),
+            peroxide_meq_per_kg=uniform(2.0, 4.5),
+            anisidine=uniform(8.0, 15.0),
             previous_hash=processing["payload_hash"],
             ledger_path=ledger_path,
         )
         result["receipts"]["testing"] = testing
 
         # Stage 4: Encapsulation
-        encap = create_encapsulation_receipt(
-            facility_id="SIM-BOTTLE-01",
-            facility_name="Sim Bottling",
-            facility_cert_type="NSF",
+        encap = stages["encapsulation"](
             facility_cert_id=f"NSF-SIM-BOT-{cycle_num}",
-            facility_cert_hash=_make_fake_hash(f"bottle_{batch_id}"),
+            facility_cert_hash=doc_hashes["bottle"],
             lot_number=lot_number,
-            fill_date="2025-01-31T12:00:00Z",
             batch_id=batch_id,
-            capsule_count=90,
-            mg_per_capsule=1000.0,
             previous_hash=testing["payload_hash"],
             ledger_path=ledger_path,
         )
@@ -160,18 +242,14 @@ def run_single_cycle(
 
         # Stage 5: Distribution (with optional temp override)
         if config.max_temp_override is not None:
-            temps = [rng.uniform(2.0, config.max_temp_override) for _ in range(10)]
+            temps = [uniform(2.0, config.max_temp_override) for _ in range(10)]
             temps.append(config.max_temp_override)  # ensure max is hit
         else:
-            temps = [rng.uniform(2.5, 6.0) for _ in range(10)]  # within 2-8°C range
+            temps = [uniform(2.5, 6.0) for _ in range(10)]  # within 2-8°C range
 
         cold_chain = validate_cold_chain(temps, duration_days=90)
 
-        dist = create_distribution_receipt(
-            distributor_id="SIM-DIST-01",
-            distributor_name="Sim Distribution",
-            warehouse_id="SIM-WH-01",
-            warehouse_location="Simulation City",
+        dist = stages["distribution"](
             lot_number=lot_number,
             cold_chain_data=cold_chain,
             previous_hash=encap["payload_hash"],
@@ -183,24 +261,29 @@ def run_single_cycle(
         if config.tamper_chain:
             # Modify a receipt in the ledger after emission
             import json
-            with open(ledger_path, "r") as f:
-                lines = f.readlines()
-            if len(lines) >= 3:
-                # Tamper with the processing receipt (line index 1)
-                tampered = json.loads(lines[1])
-                tampered["yield_output_kg"] = 999.0  # obviously wrong
-                lines[1] = json.dumps(tampered) + "\n"
-                with open(ledger_path, "w") as f:
-                    f.writelines(lines)
+            flush_ledger(ledger_path)
+            with open(ledger_path, "r+b") as f:
+                data = f.read()
+                # Tamper with the processing receipt (line index 1), rewriting
+                # only from that line on; line 0 is left untouched
+                start = data.find(b"\n") + 1
+                end = data.find(b"\n", start) + 1
+                if start and end and end < len(data):
+                    tampered = json.loads(data[start:end])
+                    tampered["yield_output_kg"] = 999.0  # obviously wrong
+                    f.seek(start)
+                    f.write(json.dumps(tampered).encode("utf-8") + b"\n" + data[end:])
+                    f.truncate()
 
         # Verify chain
         chain_result = verify_chain(lot_number, ledger_path=ledger_path)
         result["chain_valid"] = chain_result["chain_valid"]
 
         # Run fraud checks
-        chain_receipts = list(chain_result["receipts"].values()) if chain_result["receipts"] else []
-        anomalies = run_all_fraud_checks(chain_receipts, ledger_path=ledger_path)
+        anomalies = run_all_fraud_checks(chain_result["receipts"].values(), ledger_path=ledger_path)
         result["anomalies"] = anomalies
+        # Sorted list rather than a set so cycle results stay JSON-serializable
+        result["anomaly_types"] = sorted({a["anomaly_type"] for a in anomalies if a.get("anomaly_type")})
 
     except StopRule as e:
         result["errors"].append(str(e))
@@ -210,11 +293,86 @@ def run_single_cycle(
     return result
 
 
-def run_scenario(config: SimConfig) -> SimResult:
+def _run_cycle_isolated(
+    config: SimConfig,
+    cycle_num: int,
+    stages: dict | None = None,
+    doc_hashes: dict | None = None,
+) -> dict:
+    """Run one cycle on its own temporary ledger and remove it afterwards.
+
+    Top-level so process pool workers can run it.
+    """
+    # Each cycle gets its own ledger to avoid cross-contamination
+    fd, ledger_path = tempfile.mkstemp(suffix=f"_{config.name}_{cycle_num}.jsonl", dir=_TMPFS_ROOT)
+    os.close(fd)
+    try:
+        return run_single_cycle(config, cycle_num, ledger_path, stages=stages,
+                                doc_hashes=doc_hashes)
+    finally:
+        flush_ledger(ledger_path)
+        try:
+            os.unlink(ledger_path)
+        except OSError:
+            pass
+
+
+def _score_cycle(config: SimConfig, sim_result: SimResult, cycle_result: dict) -> None:
+    """Fold one cycle's outcome into sim_result for the scenario type."""
+    anomaly_types = set(cycle_result["anomaly_types"])
+
+    # Evaluate success based on scenario type
+    if config.name == "BASELINE":
+        if cycle_result["chain_valid"] and not cycle_result["anomalies"] and not cycle_result["errors"]:
+            sim_result.successes += 1
+        else:
+            sim_result.failures += 1
+            if cycle_result["anomalies"]:
+                sim_result.false_positives += len(cycle_result["anomalies"])
+
+    elif config.name == "DILUTION_FRAUD":
+        if "YIELD_HIGH" in anomaly_types:
+            sim_result.successes += 1
+        else:
+            sim_result.failures += 1
+            sim_result.false_negatives += 1
+
+    elif config.name == "COLD_CHAIN_FAILURE":
+        if "COLD_CHAIN_DEGRADATION" in anomaly_types:
+            sim_result.successes += 1
+        else:
+            sim_result.failures += 1
+            sim_result.false_negatives += 1
+
+    elif config.name == "LABEL_FRAUD":
+        if "LABEL_FRAUD" in anomaly_types:
+            sim_result.successes += 1
+        else:
+            sim_result.failures += 1
+            sim_result.false_negatives += 1
+
+    elif config.name == "CHAIN_INTEGRITY":
+        if not cycle_result["chain_valid"]:
+            sim_result.successes += 1  # correctly detected tamper
+        else:
+            sim_result.failures += 1
+            sim_result.false_negatives += 1
+
+
+def run_scenario(config: SimConfig, processes: int = 1) -> SimResult:
     """Run a full Monte Carlo scenario.
 
+    Cycles are independent (own seed, own ledger), so with more than one
+    process they are fanned out over a spawn-based pool and scored here in
+    cycle order; results match a serial run.
+
     Args:
         config: Simulation configuration.
+        processes: Worker count for cycles. 1 (the default) runs in-process.
+            More than 1 starts a spawn pool, so the calling script must
+            guard its entry point with `if __name__ == "__main__":`. Must be
+            1 inside a pool worker (daemonic processes cannot start their
+            own pool).
 
     Returns:
         SimResult with aggregated outcomes.
@@ -228,65 +386,27 @@ def run_scenario(config: SimConfig) -> SimResult:
         false_negatives=0,
     )
 
-    for i in range(config.n_cycles):
-        # Each cycle gets its own ledger to avoid cross-contamination
-        ledger_path = tempfile.mktemp(suffix=f"_{config.name}_{i}.jsonl")
+    doc_hashes = precompute_doc_hashes(config)
 
-        try:
-            cycle_result = run_single_cycle(config, i, ledger_path)
-            sim_result.cycles_run += 1
-            sim_result.details.append(cycle_result)
-
-            # Evaluate success based on scenario type
-            if config.name == "BASELINE":
-                if cycle_result["chain_valid"] and not cycle_result["anomalies"] and not cycle_result["errors"]:
-                    sim_result.successes += 1
-                else:
-                    sim_result.failures += 1
-                    if cycle_result["anomalies"]:
-                        sim_result.false_positives += len(cycle_result["anomalies"])
-
-            elif config.name == "DILUTION_FRAUD":
-                has_yield_anomaly = any(
-                    a.get("anomaly_type") == "YIELD_HIGH" for a in cycle_result["anomalies"]
-                )
-                if has_yield_anomaly:
-                    sim_result.successes += 1
-                else:
-                    sim_result.failures += 1
-                    sim_result.false_negatives += 1
-
-            elif config.name == "COLD_CHAIN_FAILURE":
-                has_cold_chain_anomaly = any(
-                    a.get("anomaly_type") == "COLD_CHAIN_DEGRADATION" for a in cycle_result["anomalies"]
-                )
-                if has_cold_chain_anomaly:
-                    sim_result.successes += 1
-                else:
-                    sim_result.failures += 1
-                    sim_result.false_negatives += 1
-
-            elif config.name == "LABEL_FRAUD":
-                has_label_anomaly = any(
-                    a.get("anomaly_type") == "LABEL_FRAUD" for a in cycle_result["anomalies"]
-                )
-                if has_label_anomaly:
-                    sim_result.successes += 1
-                else:
-                    sim_result.failures += 1
-                    sim_result.false_negatives += 1
-
-            elif config.name == "CHAIN_INTEGRITY":
-                if not cycle_result["chain_valid"]:
-                    sim_result.successes += 1  # correctly detected tamper
-                else:
-                    sim_result.failures += 1
-                    sim_result.false_negatives += 1
-
-        finally:
-            try:
-                os.unlink(ledger_path)
-            except OSError:
-                pass
+    processes = min(processes, config.n_cycles)
+
+    if processes <= 1:
+        stages = make_stage_factories()
+        cycle_results = (
+            _run_cycle_isolated(config, i, stages=stages, doc_hashes=doc_hashes[i])
+            for i in range(config.n_cycles)
+        )
+    else:
+        args = [(config, i, None, doc_hashes[i]) for i in range(config.n_cycles)]
+        with mp.get_context("spawn").Pool(processes=processes) as pool:
+            cycle_results = pool.starmap(
+                _run_cycle_isolated, args,
+                chunksize=max(1, config.n_cycles // (4 * processes)),
+            )
+
+    for cycle_result in cycle_results:
+        sim_result.cycles_run += 1
+        sim_result.details.append(cycle_result)
+        _score_cycle(config, sim_result, cycle_result)
 
     return sim_result
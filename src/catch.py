@@ -7,7 +7,7 @@ Species ID, fishery approval, import docs, fishery certification.
 
 import os
 
-from .core import dual_hash, emit_receipt, find_receipt, StopRule
+from .core import dual_hash_file, emit_receipt, find_receipt, StopRule
 
 # FDA-approved fish oil species
 APPROVED_SPECIES = {
@@ -28,7 +28,7 @@ APPROVED_SPECIES = {
     "Micromesistius poutassou": "Blue Whiting",
 }
 
-FISHERY_CERT_TYPES = {"MSC", "FriendOfSea", "None"}
+FISHERY_CERT_TYPES = frozenset({"MSC", "FriendOfSea", "None"})
 
 
 def validate_species(species: str) -> bool:
@@ -58,9 +58,7 @@ def hash_document(file_path: str) -> str:
     if not os.path.exists(file_path):
         raise StopRule(f"Document not found: {file_path}")
 
-    with open(file_path, "rb") as f:
-        data = f.read()
-    return dual_hash(data)
+    return dual_hash_file(file_path)
 
 
 def create_catch_receipt(
@@ -91,8 +89,9 @@ def create_catch_receipt(
     Raises:
         StopRule: If species not approved or cert data inconsistent.
     """
-    # Validate species
-    if not validate_species(species):
+    # Validate species (one lookup yields both approval and common name)
+    species_common = APPROVED_SPECIES.get(species)
+    if species_common is None:
         raise StopRule(f"Species not FDA-approved for fish oil: {species}")
 
     # Validate fishery cert consistency
@@ -104,7 +103,6 @@ def create_catch_receipt(
             f"Fishery cert type {fishery_cert_type} claimed but no cert hash provided"
         )
 
-    species_common = APPROVED_SPECIES[species]
     fishery_approved = True  # If we get here, fishery is approved
 
     payload = {
@@ -6,10 +6,9 @@ Verifies each hash matches recomputed value.
 Generates consumer-facing QR payload.
 """
 
-import json
 from datetime import datetime, timezone
 
-from .core import dual_hash, load_ledger, StopRule
+from .core import LedgerReader, canonical_json, dual_hash_uncached, dumps_json, StopRule
 
 # Receipt stage order
 STAGE_ORDER = ["catch", "processing", "testing", "encapsulation", "distribution"]
@@ -18,6 +17,11 @@ STAGE_ORDER = ["catch", "processing", "testing", "encapsulation", "distribution"
 def verify_single_receipt(receipt: dict) -> bool:
     """Recompute payload hash and compare to stored value.
 
+    The body is hashed uncached, like emit_receipt does: receipt bodies are
+    one-off inputs and would only crowd dual_hash's memo of shared blobs.
+    Nothing is cached by the stored payload_hash either, so an edited
+    receipt that keeps its old hash still fails.
+
     Args:
         receipt: Receipt dict to verify.
 
@@ -29,39 +33,27 @@ def verify_single_receipt(receipt: dict) -> bool:
         return False
 
     # Rebuild the receipt without payload_hash and merkle_root for hashing
-    check = {}
-    for k, v in receipt.items():
-        if k not in ("payload_hash", "merkle_root"):
-            check[k] = v
+    check = {k: v for k, v in receipt.items() if k != "payload_hash" and k != "merkle_root"}
 
-    payload_bytes = json.dumps(check, sort_keys=True, default=str).encode("utf-8")
-    computed = dual_hash(payload_bytes)
+    payload_bytes = canonical_json(check).encode("utf-8")
+    computed = dual_hash_uncached(payload_bytes)
 
     return computed == stored_hash
 
 
-def _find_receipt_by_hash(payload_hash: str, receipts: list[dict]) -> dict | None:
+def _find_receipt_by_hash(payload_hash: str, ledger: LedgerReader) -> dict | None:
     """Find a receipt by its payload_hash."""
-    for r in receipts:
-        if r.get("payload_hash") == payload_hash:
-            return r
-    return None
+    return ledger.find(payload_hash=payload_hash)
 
 
-def _find_distribution_by_lot(lot_number: str, receipts: list[dict]) -> dict | None:
+def _find_distribution_by_lot(lot_number: str, ledger: LedgerReader) -> dict | None:
     """Find distribution receipt by lot number."""
-    for r in receipts:
-        if r.get("receipt_type") == "distribution" and r.get("lot_number") == lot_number:
-            return r
-    return None
+    return ledger.find(lot_number=lot_number, receipt_type="distribution")
 
 
-def _find_encapsulation_by_lot(lot_number: str, receipts: list[dict]) -> dict | None:
+def _find_encapsulation_by_lot(lot_number: str, ledger: LedgerReader) -> dict | None:
     """Find encapsulation receipt by lot number."""
-    for r in receipts:
-        if r.get("receipt_type") == "encapsulation" and r.get("lot_number") == lot_number:
-            return r
-    return None
+    return ledger.find(lot_number=lot_number, receipt_type="encapsulation")
 
 
 def verify_chain(lot_number: str, ledger_path: str | None = None) -> dict:
@@ -77,8 +69,12 @@ def verify_chain(lot_number: str, ledger_path: str | None = None) -> dict:
     Returns:
         Dict with chain receipts, verification status, and any errors.
     """
-    receipts = load_ledger(ledger_path)
+    with LedgerReader(ledger_path) as ledger:
+        return _verify_chain(lot_number, ledger)
+
 
+def _verify_chain(lot_number: str, ledger: LedgerReader) -> dict:
+    """verify_chain body; only the receipts on the chain are parsed."""
     result = {
         "lot_number": lot_number,
         "chain_length": 0,
@@ -89,13 +85,13 @@ def verify_chain(lot_number: str, ledger_path: str | None = None) -> dict:
     }
 
     # Step 1: Find distribution receipt
-    dist = _find_distribution_by_lot(lot_number, receipts)
+    dist = _find_distribution_by_lot(lot_number, ledger)
     if not dist:
         result["errors"].append(f"No distribution receipt found for lot {lot_number}")
         return result
 
     # Step 2: Find encapsulation receipt (by lot_number on dist receipt, walk back)
-    encap = _find_encapsulation_by_lot(lot_number, receipts)
+    encap = _find_encapsulation_by_lot(lot_number, ledger)
     if not encap:
         result["errors"].append(f"No encapsulation receipt found for lot {lot_number}")
         return result
@@ -113,7 +109,7 @@ def verify_chain(lot_number: str, ledger_path: str | None = None) -> dict:
             result["errors"].append(f"Missing previous_hash on {current.get('receipt_type')} receipt")
             break
 
-        prev_receipt = _find_receipt_by_hash(prev_hash, receipts)
+        prev_receipt = _find_receipt_by_hash(prev_hash, ledger)
         if not prev_receipt:
             result["errors"].append(f"Cannot find receipt with hash {prev_hash[:40]}...")
             break
@@ -154,7 +150,19 @@ def get_chain_summary(lot_number: str, ledger_path: str | None = None) -> dict:
     Returns:
         Summary dict with key verification points.
     """
-    chain = verify_chain(lot_number, ledger_path=ledger_path)
+    return summarize_chain(verify_chain(lot_number, ledger_path=ledger_path))
+
+
+def summarize_chain(chain: dict) -> dict:
+    """Build the consumer-friendly summary from a verify_chain result.
+
+    Args:
+        chain: Result dict returned by verify_chain.
+
+    Returns:
+        Summary dict with key verification points.
+    """
+    lot_number = chain["lot_number"]
 
     if not chain["chain_valid"]:
         return {
@@ -206,10 +214,22 @@ def generate_qr_payload(lot_number: str, ledger_path: str | None = None) -> str:
     Returns:
         JSON string for QR code content.
     """
-    summary = get_chain_summary(lot_number, ledger_path=ledger_path)
+    return build_qr_payload(get_chain_summary(lot_number, ledger_path=ledger_path))
+
+
+def build_qr_payload(summary: dict) -> str:
+    """Render a chain summary as the QR code JSON payload.
+
+    Args:
+        summary: Summary dict returned by summarize_chain.
+
+    Returns:
+        JSON string for QR code content.
+    """
+    lot_number = summary["lot"]
 
     if not summary.get("valid"):
-        return json.dumps({"lot": lot_number, "valid": False, "errors": summary.get("errors", [])})
+        return dumps_json({"lot": lot_number, "valid": False, "errors": summary.get("errors", [])})
 
     qr = {
         "lot": lot_number,
@@ -225,4 +245,4 @@ def generate_qr_payload(lot_number: str, ledger_path: str | None = None) -> str:
         "verification_url": f"https://verify.fishoilproof.io/{lot_number}",
     }
 
-    return json.dumps(qr, indent=2)
+    return dumps_json(qr, indent=True)
@@ -6,28 +6,123 @@ LAW_2 = "No test -> not shipped"
 LAW_3 = "No gate -> not alive"
 """
 
+import atexit
+import functools
 import hashlib
 import json
+import mmap
 import os
+import re
 import time
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
 
 import blake3
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Ledger path (append-only)
 LEDGER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "receipts.jsonl")
 
 # Default tenant for demo
 DEFAULT_TENANT = "fishoilproof-demo"
 
+# Per-receipt Merkle root; FISHOIL_MERKLE=0 stores null instead (nothing verifies it)
+ENABLE_MERKLE_ROOT = os.environ.get("FISHOIL_MERKLE", "1") != "0"
+
+# Hash constructors bound once; dual_hash runs for every receipt and document
+_sha256 = hashlib.sha256
+_blake3 = blake3.blake3
+
+# emit_receipt timestamps: "YYYY-MM-DDTHH:MM:SS" prefix reused within the same second
+_TS_CACHE_SEC = -1
+_TS_CACHE_PREFIX = ""
+
+# Append handles kept open across emit_receipt calls, keyed by absolute path:
+# [file, (st_dev, st_ino) of the file it was opened on]
+_LEDGER_HANDLES: dict = {}
+LEDGER_HANDLES_MAX = 32
+
+# field_index state per (ledger, receipt_type, key):
+# [inode, bytes indexed, value -> line offset, mtime_ns, last line consumed]
+_FIELD_INDEXES: dict = {}
+FIELD_INDEXES_MAX = 64
+
+# Inputs at least this large hash SHA256 on a worker thread while BLAKE3 runs
+# here; both release the GIL. Below it, thread handoff costs more than it saves.
+DUAL_HASH_PARALLEL_MIN_BYTES = 1024 * 1024
+_HASH_POOL = None
+
+# Exact dual_hash output: "SHA256_<64 hex>:BLAKE3_<64 hex>"
+_DUAL_HASH_FULLMATCH = re.compile(r"SHA256_[0-9a-f]{64}:BLAKE3_[0-9a-f]{64}").fullmatch
+
+# Blobs up to this size are memoized by dual_hash (cert hashes and short ids
+# shared across lots), in at most DUAL_HASH_CACHE_SIZE entries (~1 MiB pinned)
+DUAL_HASH_CACHE_MAX_BYTES = 4 * 1024
+DUAL_HASH_CACHE_SIZE = 256
+
+
+# Canonical form hashed into payload_hash; built once instead of per json.dumps call
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+
+def canonical_json(obj) -> str:
+    """Serialize obj in the canonical form used for payload hashes.
+
+    Identical to json.dumps(obj, sort_keys=True, default=str); these bytes
+    define every stored payload_hash and must never change.
+
+    Args:
+        obj: Receipt (or any JSON-serializable value).
+
+    Returns:
+        Canonical JSON string.
+    """
+    return _CANONICAL_ENCODER.encode(obj)
+
+
+def dumps_json(obj, indent: bool = False) -> str:
+    """Serialize a result for CLI/MCP output.
+
+    Uses orjson when installed, stdlib json otherwise. Output only: payload
+    hashes always use the canonical json.dumps(sort_keys=True) encoding.
+    Values orjson cannot render at all or would change (integers beyond 64
+    bits; NaN/inf, which it writes as null) go through stdlib json instead.
+    The text itself still differs between the two: orjson writes compact
+    separators, non-ASCII characters as raw UTF-8 rather than \\u escapes,
+    and datetimes natively in RFC 3339 ("2025-01-31T14:22:47+00:00")
+    rather than via str() ("2025-01-31 14:22:47+00:00").
+
+    Args:
+        obj: JSON-compatible object; unknown types are rendered with str().
+        indent: Pretty-print with 2-space indentation.
+
+    Returns:
+        JSON string.
+    """
+    if HAS_ORJSON and not (type(obj) in (dict, list) and _has_out_of_range_float(obj)):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+        except TypeError:
+            pass  # e.g. "Integer exceeds 64-bit range"
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
 
 class StopRule(Exception):
     """Raised when a stoprule triggers. Never catch silently."""
     pass
 
 
-def dual_hash(data: bytes | str) -> str:
-    """Compute dual hash in SHA256:BLAKE3 format.
+def dual_hash_uncached(data: bytes | str) -> str:
+    """Compute dual hash in SHA256:BLAKE3 format, bypassing dual_hash's memo.
+
+    Use for one-off inputs such as receipt bodies, which would only evict
+    the shared blobs the memo exists for.
 
     Args:
         data: Input bytes or string to hash.
@@ -38,15 +133,123 @@ def dual_hash(data: bytes | str) -> str:
     if isinstance(data, str):
         data = data.encode("utf-8")
 
-    sha256_hex = hashlib.sha256(data).hexdigest()
-    blake3_hex = blake3.blake3(data).hexdigest()
+    if len(data) >= DUAL_HASH_PARALLEL_MIN_BYTES and (os.cpu_count() or 1) > 1:
+        sha_future = _hash_pool().submit(_sha256, data)
+        blake3_hex = _blake3(data).hexdigest()
+        sha256_hex = sha_future.result().hexdigest()
+    else:
+        sha256_hex = _sha256(data).hexdigest()
+        blake3_hex = _blake3(data).hexdigest()
+
+    return f"SHA256_{sha256_hex}:BLAKE3_{blake3_hex}"
+
+
+def _hash_pool():
+    """Single-worker executor for the SHA256 half of large dual hashes."""
+    global _HASH_POOL
+    if _HASH_POOL is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _HASH_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dual_hash")
+    return _HASH_POOL
+
+
+def _reset_hash_pool() -> None:
+    """Drop the inherited pool in a forked child; its worker thread did not survive the fork."""
+    global _HASH_POOL
+    _HASH_POOL = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_hash_pool)
+
 
+_dual_hash_cached = functools.lru_cache(maxsize=DUAL_HASH_CACHE_SIZE)(dual_hash_uncached)
+
+
+def dual_hash(data: bytes | str) -> str:
+    """Compute dual hash in SHA256:BLAKE3 format.
+
+    Inputs up to DUAL_HASH_CACHE_MAX_BYTES are memoized, so the same small
+    blob shared by every lot in a batch is only hashed once. Inputs that are
+    hashed exactly once should go through dual_hash_uncached instead, so
+    they don't evict the entries worth keeping.
+
+    Args:
+        data: Input bytes or string to hash.
+
+    Returns:
+        String in format "SHA256_<hex>:BLAKE3_<hex>"
+    """
+    if isinstance(data, (bytes, str)) and len(data) <= DUAL_HASH_CACHE_MAX_BYTES:
+        return _dual_hash_cached(data)
+    return dual_hash_uncached(data)
+
+
+def dual_hash_many(blobs: list[bytes | str]) -> list[str]:
+    """Dual-hash several documents in one call.
+
+    Args:
+        blobs: Inputs to hash.
+
+    Returns:
+        List of "SHA256_<hex>:BLAKE3_<hex>" strings, in input order.
+    """
+    _hash = dual_hash
+    return [_hash(b) for b in blobs]
+
+
+@functools.lru_cache(maxsize=256)
+def _dual_hash_file_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as f:
+        if size < DUAL_HASH_PARALLEL_MIN_BYTES or (os.cpu_count() or 1) == 1:
+            return dual_hash_uncached(f.read())
+        # Large file on a multi-core host: hash straight from the page cache,
+        # SHA256 on the pool thread while BLAKE3 hashes its tree on all cores
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            sha_future = _hash_pool().submit(_sha256, data)
+            blake3_hex = _blake3(data, max_threads=_blake3.AUTO).hexdigest()
+            sha256_hex = sha_future.result().hexdigest()
     return f"SHA256_{sha256_hex}:BLAKE3_{blake3_hex}"
 
 
+def dual_hash_file(path: str) -> str:
+    """Dual-hash a file, reusing the result while the file is unchanged.
+
+    Cached on (path, mtime, size) so an unchanged cert file is read once.
+    Files of DUAL_HASH_PARALLEL_MIN_BYTES or more are hashed from an mmap
+    on multi-core hosts, with BLAKE3 multithreaded.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        String in format "SHA256_<hex>:BLAKE3_<hex>"
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    st = os.stat(path)
+    return _dual_hash_file_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def validate_dual_hash(value) -> bool:
+    """Check that value is exactly in dual_hash output format.
+
+    Args:
+        value: Candidate hash string.
+
+    Returns:
+        True if value is "SHA256_<64 hex>:BLAKE3_<64 hex>" (lowercase hex).
+    """
+    return type(value) is str and _DUAL_HASH_FULLMATCH(value) is not None
+
+
 def merkle_root(items: list) -> str:
     """Compute BLAKE3 Merkle tree root.
 
+    emit_receipt calls this with the receipt's own field values, so the cost
+    is bounded by the receipt's field count, not by ledger size.
+
     Args:
         items: List of strings or bytes to build tree from.
 
@@ -54,35 +257,71 @@ def merkle_root(items: list) -> str:
         Hex string of Merkle root.
     """
     if not items:
-        return blake3.blake3(b"empty").hexdigest()
+        return _blake3(b"empty").hexdigest()
 
     # Leaf hashes
-    leaves = []
-    for item in items:
-        if isinstance(item, str):
-            item = item.encode("utf-8")
-        leaves.append(blake3.blake3(item).digest())
+    leaves = [_blake3(item.encode("utf-8") if isinstance(item, str) else item).digest()
+              for item in items]
 
-    # Build tree bottom-up
+    # Build tree bottom-up, hashing adjacent pairs
     while len(leaves) > 1:
-        next_level = []
-        for i in range(0, len(leaves), 2):
-            if i + 1 < len(leaves):
-                combined = leaves[i] + leaves[i + 1]
-            else:
-                combined = leaves[i] + leaves[i]  # duplicate odd leaf
-            next_level.append(blake3.blake3(combined).digest())
-        leaves = next_level
+        if len(leaves) & 1:
+            leaves.append(leaves[-1])  # duplicate odd leaf
+        pairs = iter(leaves)
+        leaves = [_blake3(left + right).digest() for left, right in zip(pairs, pairs)]
 
     return leaves[0].hex()
 
 
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 with microseconds, e.g. 2025-01-31T14:22:47.123456+00:00.
+
+    The date/time prefix is formatted once per second. Unlike
+    datetime.isoformat(), microseconds are always present.
+    """
+    global _TS_CACHE_SEC, _TS_CACHE_PREFIX
+    now_ns = time.time_ns()
+    sec, frac_ns = divmod(now_ns, 1_000_000_000)
+    if sec != _TS_CACHE_SEC:
+        _TS_CACHE_PREFIX = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _TS_CACHE_SEC = sec
+    return f"{_TS_CACHE_PREFIX}.{frac_ns // 1000:06d}+00:00"
+
+
+def _build_receipt(receipt_type: str, payload: dict, tenant_id: str | None) -> tuple[dict, bytes]:
+    """Build a receipt and its ledger line, serializing the receipt once."""
+    receipt = {
+        "receipt_type": receipt_type,
+        "ts": _utc_timestamp(),
+        "tenant_id": tenant_id or DEFAULT_TENANT,
+    }
+    receipt.update(payload)
+
+    # Compute payload hash over the full receipt content
+    canonical = canonical_json(receipt)
+    payload_hash = receipt["payload_hash"] = dual_hash_uncached(canonical.encode("utf-8"))
+
+    # Compute merkle root over all field values
+    if ENABLE_MERKLE_ROOT:
+        root = receipt["merkle_root"] = merkle_root([str(v) for v in receipt.values()])
+        root_json = f'"{root}"'
+    else:
+        receipt["merkle_root"] = None
+        root_json = "null"
+
+    # Ledger line: the canonical body with the two hex-only hash fields
+    # spliced onto the end
+    line = f'{canonical[:-1]}, "payload_hash": "{payload_hash}", "merkle_root": {root_json}}}\n'
+    return receipt, line.encode("utf-8")
+
+
 def emit_receipt(receipt_type: str, payload: dict, tenant_id: str | None = None,
                  ledger_path: str | None = None) -> dict:
     """Emit a receipt to the append-only ledger.
 
     Every receipt gets: ts, tenant_id, payload_hash, receipt_type.
-    Appended to receipts.jsonl immediately (not batched).
+    Appended to receipts.jsonl immediately (not batched). The append handle
+    is kept open for reuse; see flush_ledger.
 
     Args:
         receipt_type: Type of receipt (catch, processing, testing, etc.)
@@ -93,31 +332,154 @@ def emit_receipt(receipt_type: str, payload: dict, tenant_id: str | None = None,
     Returns:
         Complete receipt dict with metadata.
     """
-    ts = datetime.now(timezone.utc).isoformat()
-    tenant = tenant_id or DEFAULT_TENANT
+    receipt, line = _build_receipt(receipt_type, payload, tenant_id)
+    f = _ledger_handle(ledger_path or LEDGER_PATH)
+    f.write(line)
+    f.flush()
+    return receipt
 
-    receipt = {
-        "receipt_type": receipt_type,
-        "ts": ts,
-        "tenant_id": tenant,
-    }
-    receipt.update(payload)
 
-    # Compute payload hash over the full receipt content
-    payload_bytes = json.dumps(receipt, sort_keys=True, default=str).encode("utf-8")
-    receipt["payload_hash"] = dual_hash(payload_bytes)
+def emit_receipts_batch(items: Iterable[tuple[str, dict, str | None]],
+                        ledger_path: str | None = None) -> list[dict]:
+    """Emit several receipts with a single ledger append.
 
-    # Compute merkle root over all field values
-    field_values = [str(v) for v in receipt.values()]
-    receipt["merkle_root"] = merkle_root(field_values)
+    Each receipt is built exactly as emit_receipt builds it; the lines are
+    then written and flushed together, so readers see all or none of them
+    once the call returns.
+
+    Args:
+        items: (receipt_type, payload, tenant_id) tuples, in ledger order.
+            tenant_id may be None for the demo tenant.
+        ledger_path: Override ledger file path.
+
+    Returns:
+        Complete receipt dicts, in input order.
+    """
+    receipts = []
+    lines = []
+    for receipt_type, payload, tenant_id in items:
+        receipt, line = _build_receipt(receipt_type, payload, tenant_id)
+        receipts.append(receipt)
+        lines.append(line)
+    if lines:
+        f = _ledger_handle(ledger_path or LEDGER_PATH)
+        f.write(b"".join(lines))
+        f.flush()
+    return receipts
+
+
+def _ledger_handle(target: str):
+    """Return a cached append handle for target, opening it on first use.
+
+    The path is stat'ed on every call; if the ledger was deleted, rotated or
+    replaced since the handle was opened, the stale handle is closed and the
+    path reopened, so appends never land on an unlinked inode.
+    """
+    key = os.path.abspath(target)
+    entry = _LEDGER_HANDLES.get(key)
+    if entry is not None:
+        try:
+            st = os.stat(key)
+            if (st.st_dev, st.st_ino) == entry[1]:
+                return entry[0]
+        except FileNotFoundError:
+            pass
+        del _LEDGER_HANDLES[key]
+        entry[0].close()
+
+    os.makedirs(os.path.dirname(key), exist_ok=True)
+    if len(_LEDGER_HANDLES) >= LEDGER_HANDLES_MAX:
+        _LEDGER_HANDLES.pop(next(iter(_LEDGER_HANDLES)))[0].close()
+    f = open(key, "ab")
+    st = os.fstat(f.fileno())
+    _LEDGER_HANDLES[key] = [f, (st.st_dev, st.st_ino)]
+    return f
+
+
+def flush_ledger(ledger_path: str | None = None) -> None:
+    """Close cached ledger append handles and drop cached field indexes.
+
+    emit_receipt flushes every line, so readers always see it, and reopens
+    the path by itself when the ledger is deleted or replaced; call this to
+    release the file descriptors and field_index memory of ledgers that are
+    no longer used.
+
+    Args:
+        ledger_path: Ledger to release. All ledgers when None.
+    """
+    if ledger_path is None:
+        entries = list(_LEDGER_HANDLES.values())
+        _LEDGER_HANDLES.clear()
+        _FIELD_INDEXES.clear()
+    else:
+        target = os.path.abspath(ledger_path)
+        entry = _LEDGER_HANDLES.pop(target, None)
+        entries = [entry] if entry is not None else []
+        for state_key in [k for k in _FIELD_INDEXES if k[0] == target]:
+            del _FIELD_INDEXES[state_key]
+    for f, _ in entries:
+        f.close()
+
+
+atexit.register(flush_ledger)
+
+
+# orjson decodes integers beyond 64 bits as floats; json.loads keeps them exact
+_FLOAT_INT64_BOUND = float(2 ** 63)
+
+
+def _has_out_of_range_float(obj) -> bool:
+    """True if obj holds a float outside +/-2**63 (or NaN/inf) at any depth."""
+    for v in obj.values() if type(obj) is dict else obj:
+        t = type(v)
+        if t is float:
+            if not -_FLOAT_INT64_BOUND < v < _FLOAT_INT64_BOUND:
+                return True
+        elif (t is dict or t is list) and _has_out_of_range_float(v):
+            return True
+    return False
+
+
+def _parse_line(line: bytes) -> dict:
+    """Decode one ledger line, via orjson when available.
+
+    Parsing only: payload hashes are always computed over stdlib json.dumps
+    bytes, so values must come back exactly as json.loads gives them. Lines
+    orjson rejects, or that may hold a >64-bit integer it turned into a
+    float, are decoded again with json.
+    """
+    if HAS_ORJSON:
+        try:
+            receipt = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            if type(receipt) is dict and not _has_out_of_range_float(receipt):
+                return receipt
+    return json.loads(line)
+
+
+def iter_ledger(ledger_path: str | None = None) -> Iterator[dict]:
+    """Stream receipts from the ledger one at a time.
 
-    # Append to ledger
+    Only the current receipt is held in memory, so ledger-wide scans that
+    stop early or keep few results do not materialize the whole ledger.
+
+    Args:
+        ledger_path: Override ledger file path.
+
+    Yields:
+        Receipt dicts, in ledger order.
+    """
     target = ledger_path or LEDGER_PATH
-    os.makedirs(os.path.dirname(target) if os.path.dirname(target) else ".", exist_ok=True)
-    with open(target, "a") as f:
-        f.write(json.dumps(receipt, default=str) + "\n")
+    if not os.path.exists(target):
+        return
 
-    return receipt
+    with open(target, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _parse_line(line)
 
 
 def load_ledger(ledger_path: str | None = None) -> list[dict]:
@@ -129,23 +491,206 @@ def load_ledger(ledger_path: str | None = None) -> list[dict]:
     Returns:
         List of receipt dicts.
     """
+    return list(iter_ledger(ledger_path))
+
+
+def field_index(receipt_type: str, key: str, ledger_path: str | None = None) -> dict:
+    """Return the value -> line offset index of one field for one receipt type.
+
+    The index lives in memory per (ledger, receipt_type, key) and is brought
+    up to date on each call by parsing only the bytes appended since the
+    last call, so repeated lookups cost O(new receipts), not O(ledger). Any
+    change that is not a pure append (new inode, shrink, same size with a
+    new mtime, or a last indexed line that no longer sits where it was) is
+    re-indexed from the start. Only complete lines are consumed, and only
+    string values are indexed; the first receipt per value wins.
+
+    Args:
+        receipt_type: Receipt type to index.
+        key: Field name to index.
+        ledger_path: Override ledger file path.
+
+    Returns:
+        Dict mapping field value to the byte offset of its receipt line.
+        Do not mutate.
+    """
+    target = os.path.abspath(ledger_path or LEDGER_PATH)
+    state_key = (target, receipt_type, key)
+    try:
+        st = os.stat(target)
+    except FileNotFoundError:
+        _FIELD_INDEXES.pop(state_key, None)
+        return {}
+
+    state = _FIELD_INDEXES.get(state_key)
+    if (state is not None and state[0] == st.st_ino and state[1] == st.st_size
+            and state[3] == st.st_mtime_ns):
+        return state[2]
+
+    type_needle = json.dumps(receipt_type).encode("utf-8")
+    key_needle = json.dumps(key).encode("utf-8")
+    with open(target, "rb") as f:
+        if state is not None and not (
+            state[0] == st.st_ino and state[1] < st.st_size
+            and _ends_with_line(f, state[1], state[4])
+        ):
+            state = None
+        if state is None:
+            _FIELD_INDEXES.pop(state_key, None)
+            while len(_FIELD_INDEXES) >= FIELD_INDEXES_MAX:
+                del _FIELD_INDEXES[next(iter(_FIELD_INDEXES))]
+            state = _FIELD_INDEXES[state_key] = [st.st_ino, 0, {}, None, b""]
+        _, offset, index, _, last_line = state
+
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            line_offset = offset
+            offset += len(line)
+            last_line = line
+            if type_needle not in line or key_needle not in line:
+                continue
+            receipt = _parse_line(line)
+            value = receipt.get(key)
+            if receipt.get("receipt_type") == receipt_type and type(value) is str:
+                index.setdefault(value, line_offset)
+    state[1] = offset
+    state[3] = st.st_mtime_ns
+    state[4] = last_line
+    return index
+
+
+def _ends_with_line(f, offset: int, line: bytes) -> bool:
+    """True if line (with its newline) still ends at offset in f."""
+    if not line:
+        return offset == 0
+    f.seek(offset - len(line))
+    return f.read(len(line)) == line
+
+
+class LedgerReader:
+    """Read-only mmap view of a ledger that parses only the lines it returns.
+
+    find() locates candidate lines with a byte search for the JSON-encoded
+    value (as the ledger writes it), so a lookup costs a memory scan plus a
+    parse of the few lines that contain the value, not a parse of every line.
+    Use as a context manager.
+    """
+
+    def __init__(self, ledger_path: str | None = None):
+        target = ledger_path or LEDGER_PATH
+        self._file = None
+        self._data = b""
+        if os.path.exists(target) and os.path.getsize(target) > 0:
+            self._file = open(target, "rb")
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "LedgerReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+            self._data = b""
+
+    def find(self, **fields) -> dict | None:
+        """Return the first receipt, in ledger order, matching every field.
+
+        Args:
+            **fields: Field name -> required value. The first value is the
+                byte-search needle, so pass the most selective field first.
+
+        Returns:
+            Matching receipt dict or None.
+        """
+        data = self._data
+        needle = json.dumps(next(iter(fields.values()))).encode("utf-8")
+        pos = 0
+        while True:
+            i = data.find(needle, pos)
+            if i < 0:
+                return None
+            start = data.rfind(b"\n", 0, i) + 1
+            end = data.find(b"\n", i)
+            if end < 0:
+                end = len(data)
+            line = data[start:end].strip()
+            if line:
+                receipt = _parse_line(line)
+                if all(receipt.get(k) == v for k, v in fields.items()):
+                    return receipt
+            pos = end + 1
+
+
+def load_ledger_filtered(receipt_type: str | None = None,
+                         lot_number: str | None = None,
+                         batch_id: str | None = None,
+                         ledger_path: str | None = None) -> list[dict]:
+    """Load only the receipts matching every given filter.
+
+    Lines that do not contain each filter value (JSON-encoded, as the ledger
+    writes it) are skipped before parsing, so non-matching receipts are
+    never decoded.
+
+    Args:
+        receipt_type: Receipt type to match.
+        lot_number: Lot number to match.
+        batch_id: Batch ID to match.
+        ledger_path: Override ledger file path.
+
+    Returns:
+        List of matching receipt dicts, in ledger order.
+    """
     target = ledger_path or LEDGER_PATH
     if not os.path.exists(target):
         return []
 
+    filters = [(k, v) for k, v in (("receipt_type", receipt_type),
+                                   ("lot_number", lot_number),
+                                   ("batch_id", batch_id)) if v]
+    needles = [json.dumps(v).encode("utf-8") for _, v in filters]
+
     receipts = []
-    with open(target, "r") as f:
+    with open(target, "rb") as f:
         for line in f:
+            if not all(n in line for n in needles):
+                continue
             line = line.strip()
-            if line:
-                receipts.append(json.loads(line))
+            if not line:
+                continue
+            receipt = _parse_line(line)
+            if all(receipt.get(k) == v for k, v in filters):
+                receipts.append(receipt)
     return receipts
 
 
+def _read_receipt_at(ledger_path: str, offset: int) -> dict:
+    """Parse the ledger line starting at offset; {} if it is not a receipt."""
+    with open(ledger_path, "rb") as f:
+        f.seek(offset)
+        line = f.readline().strip()
+    try:
+        receipt = _parse_line(line)
+    except ValueError:
+        return {}
+    return receipt if type(receipt) is dict else {}
+
+
 def find_receipt(receipt_type: str, key: str, value: str,
                  ledger_path: str | None = None) -> dict | None:
     """Find a specific receipt in the ledger.
 
+    String values are looked up in field_index, so a lookup parses one line
+    plus whatever was appended since the previous lookup. field_index skips
+    an unterminated last line, so on a miss that line is parsed directly.
+    Other values fall back to a ledger scan.
+
     Args:
         receipt_type: Type to filter by.
         key: Field name to match.
@@ -155,7 +700,27 @@ def find_receipt(receipt_type: str, key: str, value: str,
     Returns:
         First matching receipt or None.
     """
-    for receipt in load_ledger(ledger_path):
+    if type(value) is str:
+        target = ledger_path or LEDGER_PATH
+        state_key = (os.path.abspath(target), receipt_type, key)
+        for _ in range(2):
+            offset = field_index(receipt_type, key, target).get(value)
+            if offset is None:
+                state = _FIELD_INDEXES.get(state_key)
+                if state is None or os.path.getsize(target) <= state[1]:
+                    return None
+                # Last line has no trailing newline yet (not indexed)
+                receipt = _read_receipt_at(target, state[1])
+            else:
+                receipt = _read_receipt_at(target, offset)
+            if receipt.get("receipt_type") == receipt_type and receipt.get(key) == value:
+                return receipt
+            if offset is None:
+                return None
+            # Ledger rewritten in place: re-index from the start and retry once
+            _FIELD_INDEXES.pop(state_key, None)
+
+    for receipt in iter_ledger(ledger_path):
         if receipt.get("receipt_type") == receipt_type and receipt.get(key) == value:
             return receipt
     return None
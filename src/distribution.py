@@ -7,11 +7,33 @@ Distributor data, warehouse data, temperature logs.
 
 from .core import emit_receipt, find_receipt, StopRule
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 # Cold chain thresholds
 COLD_CHAIN_TARGET_MIN = 2.0   # °C
 COLD_CHAIN_TARGET_MAX = 8.0   # °C
 COLD_CHAIN_MAX_DEVIATIONS = 3
 
+# cold_chain for lots without tracking; copied per receipt since the returned
+# receipt holds it and callers may mutate it
+_EMPTY_COLD_CHAIN = {
+    "enabled": False,
+    "avg_temp_c": None,
+    "min_temp_c": None,
+    "max_temp_c": None,
+    "duration_days": 0,
+    "deviations_count": 0,
+    "temp_log_hash": None,
+    "cold_chain_pass": False,
+}
+
+# IoT logs at least this long are reduced with NumPy; shorter ones stay in Python
+NUMPY_MIN_READINGS = 256
+
 
 def validate_cold_chain(
     temps: list[float],
@@ -20,15 +42,20 @@ def validate_cold_chain(
 ) -> dict:
     """Validate cold chain temperature data.
 
+    Long logs (NUMPY_MIN_READINGS+) and ndarray inputs of any length are
+    reduced with NumPy when available; ndarrays are used without copying.
+    Either way the result matches the pure-Python reduction, including int
+    readings and NaN.
+
     Args:
-        temps: List of temperature readings in °C.
+        temps: Sequence of temperature readings in °C (list or ndarray), or None.
         duration_days: Duration of storage/transport in days.
         temp_log_hash: Dual-hash of IoT temperature log file.
 
     Returns:
         Dict with cold chain stats and pass/fail.
     """
-    if not temps:
+    if temps is None or len(temps) == 0:
         return {
             "enabled": False,
             "avg_temp_c": None,
@@ -40,10 +67,35 @@ def validate_cold_chain(
             "cold_chain_pass": False,
         }
 
-    avg_temp = sum(temps) / len(temps)
-    min_temp = min(temps)
-    max_temp = max(temps)
-    deviations = sum(1 for t in temps if t < COLD_CHAIN_TARGET_MIN or t > COLD_CHAIN_TARGET_MAX)
+    if HAS_NUMPY and (isinstance(temps, np.ndarray) or len(temps) >= NUMPY_MIN_READINGS):
+        arr = np.asarray(temps)
+        if arr.dtype.kind not in "iuf":
+            arr = arr.astype(np.float64)
+        avg_temp = float(arr.mean(dtype=np.float64))
+        if avg_temp != avg_temp:
+            # NaN reading: builtin min/max skip it unless it comes first; keep that
+            min_temp = min(temps)
+            max_temp = max(temps)
+        else:
+            # Report the first extreme reading itself, so int logs stay ints
+            lo, hi = int(arr.argmin()), int(arr.argmax())
+            if isinstance(temps, np.ndarray):
+                min_temp, max_temp = arr[lo].item(), arr[hi].item()
+            else:
+                min_temp, max_temp = temps[lo], temps[hi]
+    else:
+        arr = None
+        avg_temp = sum(temps) / len(temps)
+        min_temp = min(temps)
+        max_temp = max(temps)
+
+    # Excursions are rare: when min and max are in range there is nothing to count
+    if min_temp >= COLD_CHAIN_TARGET_MIN and max_temp <= COLD_CHAIN_TARGET_MAX:
+        deviations = 0
+    elif arr is not None:
+        deviations = int(np.count_nonzero((arr < COLD_CHAIN_TARGET_MIN) | (arr > COLD_CHAIN_TARGET_MAX)))
+    else:
+        deviations = sum(1 for t in temps if t < COLD_CHAIN_TARGET_MIN or t > COLD_CHAIN_TARGET_MAX)
 
     cold_chain_pass = max_temp <= COLD_CHAIN_TARGET_MAX and deviations <= COLD_CHAIN_MAX_DEVIATIONS
 
@@ -100,16 +152,7 @@ def create_distribution_receipt(
         Distribution receipt dict.
     """
     if cold_chain_data is None:
-        cold_chain_data = {
-            "enabled": False,
-            "avg_temp_c": None,
-            "min_temp_c": None,
-            "max_temp_c": None,
-            "duration_days": 0,
-            "deviations_count": 0,
-            "temp_log_hash": None,
-            "cold_chain_pass": False,
-        }
+        cold_chain_data = _EMPTY_COLD_CHAIN.copy()
 
     payload = {
         "distributor_id": distributor_id,
@@ -5,11 +5,16 @@ Proves GMP bottling + lot traceability.
 Facility cert, lot number, fill date, capsule specs.
 """
 
+import time
 from datetime import datetime, timezone
 
-from .core import emit_receipt, find_receipt, load_ledger, StopRule
+from .core import emit_receipt, find_receipt, validate_dual_hash, StopRule
 
-FACILITY_CERT_TYPES = {"NSF", "USP", "Other"}
+FACILITY_CERT_TYPES = frozenset({"NSF", "USP", "Other"})
+
+# generate_lot_number: "LOT-YYYY-MMDD-" prefix reused within the same UTC day
+_LOT_PREFIX_DAY = -1
+_LOT_PREFIX = ""
 
 
 def generate_lot_number(batch_id: str) -> str:
@@ -21,9 +26,14 @@ def generate_lot_number(batch_id: str) -> str:
     Returns:
         Lot number string.
     """
-    now = datetime.now(timezone.utc)
+    global _LOT_PREFIX_DAY, _LOT_PREFIX
+    day = int(time.time() // 86400)
+    if day != _LOT_PREFIX_DAY:
+        now = datetime.fromtimestamp(day * 86400, timezone.utc)
+        _LOT_PREFIX = f"LOT-{now.year}-{now.month:02d}{now.day:02d}-"
+        _LOT_PREFIX_DAY = day
     suffix = batch_id[-2:].upper() if len(batch_id) >= 2 else "XX"
-    return f"LOT-{now.year}-{now.month:02d}{now.day:02d}-{suffix}"
+    return _LOT_PREFIX + suffix
 
 
 def link_to_testing(batch_id: str, ledger_path: str | None = None) -> dict | None:
@@ -80,14 +90,12 @@ def create_encapsulation_receipt(
     if facility_cert_type not in FACILITY_CERT_TYPES:
         raise StopRule(f"Invalid facility cert type: {facility_cert_type}")
 
-    if ":" not in facility_cert_hash:
+    if not validate_dual_hash(facility_cert_hash):
         raise StopRule("Facility cert hash must be dual-hash format (SHA256:BLAKE3)")
 
-    # Validate lot uniqueness
-    existing = load_ledger(ledger_path)
-    for r in existing:
-        if r.get("receipt_type") == "encapsulation" and r.get("lot_number") == lot_number:
-            raise StopRule(f"Lot number already exists: {lot_number}")
+    # Validate lot uniqueness (find_receipt re-checks the indexed line)
+    if find_receipt("encapsulation", "lot_number", lot_number, ledger_path=ledger_path) is not None:
+        raise StopRule(f"Lot number already exists: {lot_number}")
 
     # Validate fill_date is ISO8601
     try:
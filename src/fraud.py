@@ -5,24 +5,34 @@ Yield anomaly, label fraud, cold chain degradation, contaminant exceedance.
 Each detector returns an anomaly_receipt if fraud is detected.
 """
 
-from .core import emit_receipt
+from collections.abc import Iterable
 
+from .core import emit_receipt, emit_receipts_batch
 
-def detect_yield_anomaly(processing_receipt: dict, ledger_path: str | None = None) -> dict | None:
-    """Detect yield anomalies in processing receipt.
+# Shared default for missing sub-dicts; never mutated
+_EMPTY: dict = {}
 
-    Args:
-        processing_receipt: A processing receipt dict.
-        ledger_path: Override ledger path.
+# Yield statuses that produce an anomaly; anything else returns at once
+_FLAGGED_YIELD_STATUSES = frozenset({"HIGH_DILUTION_FLAG", "LOW"})
 
-    Returns:
-        Anomaly receipt if flagged, None otherwise.
-    """
+
+def _emit_anomaly(payload: dict | None, source: dict, ledger_path: str | None) -> dict | None:
+    """Emit an anomaly payload under the source receipt's tenant, if any."""
+    if payload is None:
+        return None
+    return emit_receipt("anomaly", payload, tenant_id=source.get("tenant_id"), ledger_path=ledger_path)
+
+
+def _yield_anomaly(processing_receipt: dict) -> dict | None:
+    """Anomaly payload for yield anomalies in a processing receipt, or None."""
     yield_status = processing_receipt.get("yield_status")
+    if yield_status not in _FLAGGED_YIELD_STATUSES:
+        return None
+
     yield_ratio = processing_receipt.get("yield_ratio", 0)
 
     if yield_status == "HIGH_DILUTION_FLAG":
-        return emit_receipt("anomaly", {
+        return {
             "anomaly_type": "YIELD_HIGH",
             "severity": "FLAG",
             "source_receipt_hash": processing_receipt.get("payload_hash", ""),
@@ -33,59 +43,63 @@ def detect_yield_anomaly(processing_receipt: dict, ledger_path: str | None = Non
                 "expected_max": processing_receipt.get("yield_expected_max", 0.18),
                 "message": f"Yield {yield_ratio:.1%} exceeds expected max 18%. Possible dilution with cheaper oils.",
             },
-        }, tenant_id=processing_receipt.get("tenant_id"), ledger_path=ledger_path)
+        }
+
+    # yield_status == "LOW"
+    return {
+        "anomaly_type": "YIELD_LOW",
+        "severity": "WARNING",
+        "source_receipt_hash": processing_receipt.get("payload_hash", ""),
+        "details": {
+            "yield_ratio": yield_ratio,
+            "yield_input_kg": processing_receipt.get("yield_input_kg"),
+            "yield_output_kg": processing_receipt.get("yield_output_kg"),
+            "expected_min": processing_receipt.get("yield_expected_min", 0.12),
+            "message": f"Yield {yield_ratio:.1%} below expected min 12%. Possible extraction issue.",
+        },
+    }
 
-    if yield_status == "LOW":
-        return emit_receipt("anomaly", {
-            "anomaly_type": "YIELD_LOW",
-            "severity": "WARNING",
-            "source_receipt_hash": processing_receipt.get("payload_hash", ""),
-            "details": {
-                "yield_ratio": yield_ratio,
-                "yield_input_kg": processing_receipt.get("yield_input_kg"),
-                "yield_output_kg": processing_receipt.get("yield_output_kg"),
-                "expected_min": processing_receipt.get("yield_expected_min", 0.12),
-                "message": f"Yield {yield_ratio:.1%} below expected min 12%. Possible extraction issue.",
-            },
-        }, tenant_id=processing_receipt.get("tenant_id"), ledger_path=ledger_path)
-
-    return None
 
-
-def detect_label_fraud(testing_receipt: dict, ledger_path: str | None = None) -> dict | None:
-    """Detect label fraud in testing receipt.
+def detect_yield_anomaly(processing_receipt: dict, ledger_path: str | None = None) -> dict | None:
+    """Detect yield anomalies in processing receipt.
 
     Args:
-        testing_receipt: A testing receipt dict.
+        processing_receipt: A processing receipt dict.
         ledger_path: Override ledger path.
 
     Returns:
         Anomaly receipt if flagged, None otherwise.
     """
-    potency = testing_receipt.get("potency", {})
-    if not potency.get("potency_pass", True):
-        total = potency.get("total_omega3_mg", 0)
-        claim = potency.get("label_claim_mg", 0)
-        pct = (total / claim * 100) if claim > 0 else 0
-
-        return emit_receipt("anomaly", {
-            "anomaly_type": "LABEL_FRAUD",
-            "severity": "FLAG",
-            "source_receipt_hash": testing_receipt.get("payload_hash", ""),
-            "details": {
-                "actual_mg": total,
-                "label_claim_mg": claim,
-                "percentage_of_claim": round(pct, 1),
-                "threshold": "95%",
-                "message": f"Actual potency {total:.0f}mg is {pct:.1f}% of label claim {claim:.0f}mg (below 95% threshold).",
-            },
-        }, tenant_id=testing_receipt.get("tenant_id"), ledger_path=ledger_path)
-
-    return None
+    return _emit_anomaly(_yield_anomaly(processing_receipt), processing_receipt, ledger_path)
+
+
+def _label_fraud(testing_receipt: dict) -> dict | None:
+    """Anomaly payload for label fraud in a testing receipt, or None."""
+    potency = testing_receipt.get("potency") or _EMPTY
+    if potency.get("potency_pass", True):
+        return None
+
+    get = potency.get
+    total = get("total_omega3_mg", 0)
+    claim = get("label_claim_mg", 0)
+    pct = (total / claim * 100) if claim > 0 else 0
+
+    return {
+        "anomaly_type": "LABEL_FRAUD",
+        "severity": "FLAG",
+        "source_receipt_hash": testing_receipt.get("payload_hash", ""),
+        "details": {
+            "actual_mg": total,
+            "label_claim_mg": claim,
+            "percentage_of_claim": round(pct, 1),
+            "threshold": "95%",
+            "message": f"Actual potency {total:.0f}mg is {pct:.1f}% of label claim {claim:.0f}mg (below 95% threshold).",
+        },
+    }
 
 
-def detect_contaminant_exceed(testing_receipt: dict, ledger_path: str | None = None) -> dict | None:
-    """Detect contaminant exceedances in testing receipt.
+def detect_label_fraud(testing_receipt: dict, ledger_path: str | None = None) -> dict | None:
+    """Detect label fraud in testing receipt.
 
     Args:
         testing_receipt: A testing receipt dict.
@@ -94,40 +108,51 @@ def detect_contaminant_exceed(testing_receipt: dict, ledger_path: str | None = N
     Returns:
         Anomaly receipt if flagged, None otherwise.
     """
-    contaminants = testing_receipt.get("contaminants", {})
-    if not contaminants.get("all_pass", True):
-        failed = {}
-        if not contaminants.get("mercury_pass", True):
-            failed["mercury_ppm"] = contaminants.get("mercury_ppm")
-        if not contaminants.get("pcbs_pass", True):
-            failed["pcbs_ppm"] = contaminants.get("pcbs_ppm")
-        if not contaminants.get("dioxins_pass", True):
-            failed["dioxins_pg_per_g"] = contaminants.get("dioxins_pg_per_g")
-
-        return emit_receipt("anomaly", {
-            "anomaly_type": "CONTAMINANT_EXCEED",
-            "severity": "REJECT",
-            "source_receipt_hash": testing_receipt.get("payload_hash", ""),
-            "details": {
-                "failed_contaminants": failed,
-                "message": "One or more contaminants exceed FDA/GOED limits. Product cannot ship.",
-            },
-        }, tenant_id=testing_receipt.get("tenant_id"), ledger_path=ledger_path)
-
-    return None
+    return _emit_anomaly(_label_fraud(testing_receipt), testing_receipt, ledger_path)
+
+
+def _contaminant_exceed(testing_receipt: dict) -> dict | None:
+    """Anomaly payload for contaminant exceedances in a testing receipt, or None."""
+    contaminants = testing_receipt.get("contaminants") or _EMPTY
+    if contaminants.get("all_pass", True):
+        return None
+
+    get = contaminants.get
+    failed = {}
+    if not get("mercury_pass", True):
+        failed["mercury_ppm"] = get("mercury_ppm")
+    if not get("pcbs_pass", True):
+        failed["pcbs_ppm"] = get("pcbs_ppm")
+    if not get("dioxins_pass", True):
+        failed["dioxins_pg_per_g"] = get("dioxins_pg_per_g")
+
+    return {
+        "anomaly_type": "CONTAMINANT_EXCEED",
+        "severity": "REJECT",
+        "source_receipt_hash": testing_receipt.get("payload_hash", ""),
+        "details": {
+            "failed_contaminants": failed,
+            "message": "One or more contaminants exceed FDA/GOED limits. Product cannot ship.",
+        },
+    }
 
 
-def detect_cold_chain_degradation(distribution_receipt: dict, ledger_path: str | None = None) -> dict | None:
-    """Detect cold chain degradation in distribution receipt.
+def detect_contaminant_exceed(testing_receipt: dict, ledger_path: str | None = None) -> dict | None:
+    """Detect contaminant exceedances in testing receipt.
 
     Args:
-        distribution_receipt: A distribution receipt dict.
+        testing_receipt: A testing receipt dict.
         ledger_path: Override ledger path.
 
     Returns:
         Anomaly receipt if flagged, None otherwise.
     """
-    cold_chain = distribution_receipt.get("cold_chain", {})
+    return _emit_anomaly(_contaminant_exceed(testing_receipt), testing_receipt, ledger_path)
+
+
+def _cold_chain_degradation(distribution_receipt: dict) -> dict | None:
+    """Anomaly payload for cold chain degradation in a distribution receipt, or None."""
+    cold_chain = distribution_receipt.get("cold_chain") or _EMPTY
 
     if not cold_chain.get("enabled", False):
         return None  # Cold chain not tracked, not a fail
@@ -136,7 +161,7 @@ def detect_cold_chain_degradation(distribution_receipt: dict, ledger_path: str |
     deviations = cold_chain.get("deviations_count", 0)
 
     if max_temp is not None and max_temp > 8.0:
-        return emit_receipt("anomaly", {
+        return {
             "anomaly_type": "COLD_CHAIN_DEGRADATION",
             "severity": "FLAG",
             "source_receipt_hash": distribution_receipt.get("payload_hash", ""),
@@ -147,10 +172,10 @@ def detect_cold_chain_degradation(distribution_receipt: dict, ledger_path: str |
                 "threshold_max_c": 8.0,
                 "message": f"Max temperature {max_temp}°C exceeds 8°C threshold. Oxidation risk.",
             },
-        }, tenant_id=distribution_receipt.get("tenant_id"), ledger_path=ledger_path)
+        }
 
     if deviations > 3:
-        return emit_receipt("anomaly", {
+        return {
             "anomaly_type": "COLD_CHAIN_DEGRADATION",
             "severity": "WARNING",
             "source_receipt_hash": distribution_receipt.get("payload_hash", ""),
@@ -160,43 +185,54 @@ def detect_cold_chain_degradation(distribution_receipt: dict, ledger_path: str |
                 "threshold_deviations": 3,
                 "message": f"{deviations} temperature deviations exceed threshold of 3.",
             },
-        }, tenant_id=distribution_receipt.get("tenant_id"), ledger_path=ledger_path)
+        }
 
     return None
 
 
-def run_all_fraud_checks(chain: list[dict], ledger_path: str | None = None) -> list[dict]:
-    """Run all fraud detection algorithms on a receipt chain.
+def detect_cold_chain_degradation(distribution_receipt: dict, ledger_path: str | None = None) -> dict | None:
+    """Detect cold chain degradation in distribution receipt.
 
     Args:
-        chain: List of receipt dicts (any order).
+        distribution_receipt: A distribution receipt dict.
         ledger_path: Override ledger path.
 
     Returns:
-        List of anomaly receipts detected.
+        Anomaly receipt if flagged, None otherwise.
     """
-    anomalies = []
+    return _emit_anomaly(_cold_chain_degradation(distribution_receipt), distribution_receipt, ledger_path)
+
+
+# Anomaly payload builders that apply to each receipt type, in the order they run
+DETECTORS = {
+    "processing": (_yield_anomaly,),
+    "testing": (_label_fraud, _contaminant_exceed),
+    "distribution": (_cold_chain_degradation,),
+}
 
-    for receipt in chain:
-        rtype = receipt.get("receipt_type")
 
-        if rtype == "processing":
-            result = detect_yield_anomaly(receipt, ledger_path=ledger_path)
-            if result:
-                anomalies.append(result)
+def run_all_fraud_checks(chain: Iterable[dict], ledger_path: str | None = None) -> list[dict]:
+    """Run all fraud detection algorithms on a receipt chain.
+
+    Each receipt only runs the detectors registered for its type in DETECTORS.
+    Anomalies are collected first and appended to the ledger in one write.
 
-        elif rtype == "testing":
-            label_result = detect_label_fraud(receipt, ledger_path=ledger_path)
-            if label_result:
-                anomalies.append(label_result)
+    Args:
+        chain: Receipt dicts in any order (list, dict values view, ...).
+            Iterated once.
+        ledger_path: Override ledger path.
 
-            contaminant_result = detect_contaminant_exceed(receipt, ledger_path=ledger_path)
-            if contaminant_result:
-                anomalies.append(contaminant_result)
+    Returns:
+        List of anomaly receipts detected.
+    """
+    pending = []
+    add_pending = pending.append
+    detectors_for = DETECTORS.get
 
-        elif rtype == "distribution":
-            cold_result = detect_cold_chain_degradation(receipt, ledger_path=ledger_path)
-            if cold_result:
-                anomalies.append(cold_result)
+    for receipt in chain:
+        for detector in detectors_for(receipt.get("receipt_type"), ()):
+            payload = detector(receipt)
+            if payload is not None:
+                add_pending(("anomaly", payload, receipt.get("tenant_id")))
 
-    return anomalies
+    return emit_receipts_batch(pending, ledger_path=ledger_path)
@@ -4,10 +4,10 @@ Stage 2: Processing Receipt — Fields 4-7, 14
 Proves GMP compliance + detects dilution via yield reconciliation.
 """
 
-from .core import dual_hash, emit_receipt, find_receipt, StopRule
+from .core import dual_hash, emit_receipt, find_receipt, validate_dual_hash, StopRule
 
-EXTRACTION_METHODS = {"MolecularDistillation", "Winterization", "SupercriticalCO2"}
-GMP_CERT_TYPES = {"NSF", "USP", "Other"}
+EXTRACTION_METHODS = frozenset({"MolecularDistillation", "Winterization", "SupercriticalCO2"})
+GMP_CERT_TYPES = frozenset({"NSF", "USP", "Other"})
 
 # Expected yield range for fish -> oil
 YIELD_MIN = 0.12  # 12%
@@ -97,7 +97,7 @@ def create_processing_receipt(
     if extraction_method not in EXTRACTION_METHODS:
         raise StopRule(f"Invalid extraction method: {extraction_method}")
 
-    if ":" not in gmp_cert_hash:
+    if not validate_dual_hash(gmp_cert_hash):
         raise StopRule("GMP cert hash must be dual-hash format (SHA256:BLAKE3)")
 
     yield_ratio, yield_status = validate_yield(yield_input_kg, yield_output_kg)
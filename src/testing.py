@@ -5,9 +5,9 @@ Proves safety, potency, and freshness.
 Lab cert, contaminants, potency, oxidation markers.
 """
 
-from .core import emit_receipt, StopRule
+from .core import emit_receipt, validate_dual_hash, StopRule
 
-LAB_CERT_TYPES = {"ISO17025", "Other"}
+LAB_CERT_TYPES = frozenset({"ISO17025", "Other"})
 
 # GOED/FDA limits
 LIMITS = {
@@ -149,7 +149,7 @@ def create_testing_receipt(
     if lab_cert_type not in LAB_CERT_TYPES:
         raise StopRule(f"Invalid lab cert type: {lab_cert_type}")
 
-    if ":" not in lab_cert_hash:
+    if not validate_dual_hash(lab_cert_hash):
         raise StopRule("Lab cert hash must be dual-hash format (SHA256:BLAKE3)")
 
     contaminants = validate_contaminants(mercury_ppm, pcbs_ppm, dioxins_pg_per_g)
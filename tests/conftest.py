@@ -0,0 +1,21 @@
+"""Shared test fixtures."""
+
+import os
+
+import pytest
+
+from src.core import flush_ledger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    """Per-test ledger path; its cached append handle is released on teardown."""
+    path = str(tmp_path / "receipts.jsonl")
+    yield path
+    flush_ledger(path)
+
+
+@pytest.fixture
+def null_ledger():
+    """Ledger path for tests that must raise before anything is emitted."""
+    return os.devnull
@@ -1,7 +1,6 @@
 """Tests for Stage 1: Catch Receipt."""
 
 import os
-import tempfile
 import pytest
 
 from src.core import dual_hash, StopRule
@@ -13,17 +12,7 @@ from src.catch import (
 )
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_hashes():
     return {
         "import_docs": dual_hash(b"test_import_docs.pdf"),
@@ -54,6 +43,14 @@ class TestHashDocument:
         assert "SHA256_" in result
         assert ":BLAKE3_" in result
 
+    def test_hash_reflects_file_change(self, tmp_path):
+        f = tmp_path / "test.pdf"
+        f.write_bytes(b"original")
+        first = hash_document(str(f))
+        f.write_bytes(b"modified content")
+        assert hash_document(str(f)) != first
+        assert hash_document(str(f)) == dual_hash(b"modified content")
+
     def test_hash_nonexistent_file(self):
         with pytest.raises(StopRule, match="Document not found"):
             hash_document("/nonexistent/path.pdf")
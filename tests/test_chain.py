@@ -1,11 +1,11 @@
 """Tests for Chain Verification + QR Generation."""
 
+import copy
 import json
-import os
-import tempfile
+
 import pytest
 
-from src.core import dual_hash
+from src.core import dual_hash, flush_ledger
 from src.catch import create_catch_receipt
 from src.processing import create_processing_receipt
 from src.testing import create_testing_receipt
@@ -14,16 +14,6 @@ from src.distribution import create_distribution_receipt, validate_cold_chain
 from src.chain import verify_chain, verify_single_receipt, get_chain_summary, generate_qr_payload
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
-
-
 def _build_full_chain(ledger_path: str, lot_number: str = "LOT-TEST-CHAIN-01"):
     """Helper: build a complete 5-receipt chain."""
     catch = create_catch_receipt(
@@ -99,21 +89,65 @@ def _build_full_chain(ledger_path: str, lot_number: str = "LOT-TEST-CHAIN-01"):
     return catch, processing, testing, encap, dist
 
 
+@pytest.fixture(scope="session")
+def prebuilt_chain(tmp_path_factory):
+    """The full chain, built once per session: (receipts, ledger_path). Read-only."""
+    ledger_path = str(tmp_path_factory.mktemp("chain") / "receipts.jsonl")
+    receipts = _build_full_chain(ledger_path)
+    flush_ledger(ledger_path)
+    return receipts, ledger_path
+
+
+@pytest.fixture
+def chain(prebuilt_chain):
+    """Private copies of the prebuilt chain's receipts, safe to mutate."""
+    return copy.deepcopy(prebuilt_chain[0])
+
+
+@pytest.fixture
+def chain_ledger(prebuilt_chain):
+    """The prebuilt chain's ledger path. Do not write to it."""
+    return prebuilt_chain[1]
+
+
+@pytest.fixture(scope="module")
+def tampered_chain_bytes(prebuilt_chain):
+    """The prebuilt chain's ledger with the processing receipt's yield altered."""
+    with open(prebuilt_chain[1], "rb") as f:
+        lines = f.readlines()
+    tampered = json.loads(lines[1])
+    tampered["yield_output_kg"] = 999.0
+    lines[1] = json.dumps(tampered).encode("utf-8") + b"\n"
+    return b"".join(lines)
+
+
 class TestVerifySingleReceipt:
-    def test_valid_receipt(self, ledger):
-        catch, *_ = _build_full_chain(ledger)
+    def test_valid_receipt(self, chain):
+        catch, *_ = chain
         assert verify_single_receipt(catch) is True
 
-    def test_tampered_receipt(self, ledger):
-        catch, *_ = _build_full_chain(ledger)
+    def test_tampered_receipt(self, chain):
+        catch, *_ = chain
+        catch["species"] = "Tampered Species"
+        assert verify_single_receipt(catch) is False
+
+    def test_tampered_after_successful_verify(self, chain):
+        catch, *_ = chain
+        assert verify_single_receipt(catch) is True
         catch["species"] = "Tampered Species"
         assert verify_single_receipt(catch) is False
 
+    def test_receipt_body_not_memoized(self, chain):
+        from src.core import _dual_hash_cached
+        catch, *_ = chain
+        before = _dual_hash_cached.cache_info().currsize
+        assert verify_single_receipt(catch) is True
+        assert _dual_hash_cached.cache_info().currsize == before
+
 
 class TestVerifyChain:
-    def test_valid_chain(self, ledger):
-        _build_full_chain(ledger)
-        result = verify_chain("LOT-TEST-CHAIN-01", ledger_path=ledger)
+    def test_valid_chain(self, chain_ledger):
+        result = verify_chain("LOT-TEST-CHAIN-01", ledger_path=chain_ledger)
         assert result["chain_valid"] is True
         assert result["chain_length"] == 5
         assert len(result["errors"]) == 0
@@ -123,26 +157,18 @@ class TestVerifyChain:
         assert result["chain_valid"] is False
         assert len(result["errors"]) > 0
 
-    def test_tampered_chain(self, ledger):
-        _build_full_chain(ledger)
-        # Tamper with the ledger
-        with open(ledger, "r") as f:
-            lines = f.readlines()
-        tampered = json.loads(lines[1])
-        tampered["yield_output_kg"] = 999.0
-        lines[1] = json.dumps(tampered) + "\n"
-        with open(ledger, "w") as f:
-            f.writelines(lines)
-
-        result = verify_chain("LOT-TEST-CHAIN-01", ledger_path=ledger)
+    def test_tampered_chain(self, tampered_chain_bytes, tmp_path):
+        ledger = tmp_path / "receipts.jsonl"
+        ledger.write_bytes(tampered_chain_bytes)
+
+        result = verify_chain("LOT-TEST-CHAIN-01", ledger_path=str(ledger))
         # Chain should detect the tamper (hash mismatch)
         assert result["chain_valid"] is False
 
 
 class TestGetChainSummary:
-    def test_valid_summary(self, ledger):
-        _build_full_chain(ledger)
-        summary = get_chain_summary("LOT-TEST-CHAIN-01", ledger_path=ledger)
+    def test_valid_summary(self, chain_ledger):
+        summary = get_chain_summary("LOT-TEST-CHAIN-01", ledger_path=chain_ledger)
         assert summary["valid"] is True
         assert summary["species"] == "Peruvian Anchoveta"
         assert summary["fishery_certified"] is True
@@ -158,9 +184,8 @@ class TestGetChainSummary:
 
 
 class TestGenerateQrPayload:
-    def test_valid_qr(self, ledger):
-        _build_full_chain(ledger)
-        payload_str = generate_qr_payload("LOT-TEST-CHAIN-01", ledger_path=ledger)
+    def test_valid_qr(self, chain_ledger):
+        payload_str = generate_qr_payload("LOT-TEST-CHAIN-01", ledger_path=chain_ledger)
         payload = json.loads(payload_str)
         assert payload["lot"] == "LOT-TEST-CHAIN-01"
         assert payload["chain_length"] == 5
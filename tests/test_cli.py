@@ -0,0 +1,168 @@
+"""Tests for the CLI daemon forwarding."""
+
+import json
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def start_daemon():
+    """Start real daemons on given socket paths; stopped and joined on teardown."""
+    running = []
+
+    def start(socket_path: str) -> None:
+        server = cli._bind_daemon_socket(socket_path)
+        stop = threading.Event()
+        thread = threading.Thread(target=cli._serve_daemon, args=(server, stop), daemon=True)
+        thread.start()
+        running.append((server, stop, thread))
+
+    yield start
+    for server, stop, thread in running:
+        stop.set()
+        server.shutdown(socket.SHUT_RDWR)
+        thread.join(timeout=5)
+        server.close()
+        assert not thread.is_alive()
+
+
+@pytest.fixture
+def start_fake_daemon():
+    """Accept one request and answer with reply, close without answering
+    (reply=None), or hold the connection open unanswered (reply=b"")."""
+    running = []
+
+    def start(socket_path: str, reply: bytes | None) -> None:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen()
+        release = threading.Event()
+
+        def serve():
+            conn, _ = server.accept()
+            with conn, conn.makefile("rwb") as stream:
+                stream.readline()
+                if reply:
+                    stream.write(reply)
+                    stream.flush()
+                elif reply is not None:
+                    release.wait(5)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        running.append((server, release, thread))
+
+    yield start
+    for server, release, thread in running:
+        release.set()
+        thread.join(timeout=5)
+        server.close()
+        assert not thread.is_alive()
+
+
+def _raw_request(socket_path: str, payload: bytes) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+        sock.sendall(payload)
+        with sock.makefile("rb") as stream:
+            return json.loads(stream.readline())
+
+
+class TestForwardToDaemon:
+    def test_round_trip(self, tmp_path, monkeypatch, capsys, start_daemon):
+        socket_path = str(tmp_path / "sock")
+        start_daemon(socket_path)
+        monkeypatch.setattr(cli, "DAEMON_SOCKET", socket_path)
+        with pytest.raises(SystemExit) as exc:
+            cli._forward_to_daemon(["fishoil", "verify"])
+        assert exc.value.code == 2
+        assert "lot_number" in capsys.readouterr().err
+        assert cli._forward_to_daemon(["fishoil"]) is True
+        assert "commands:" in capsys.readouterr().out
+
+    def test_bare_socket_filename(self, tmp_path, monkeypatch, start_daemon):
+        monkeypatch.chdir(tmp_path)
+        start_daemon("sock")
+        monkeypatch.setattr(cli, "DAEMON_SOCKET", str(tmp_path / "sock"))
+        assert cli._forward_to_daemon(["fishoil"]) is True
+
+    def test_no_socket_runs_in_process(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cli, "DAEMON_SOCKET", str(tmp_path / "missing"))
+        assert cli._forward_to_daemon(["fishoil"]) is False
+
+    def test_stale_socket_runs_in_process(self, tmp_path, monkeypatch):
+        socket_path = str(tmp_path / "sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.bind(socket_path)
+        monkeypatch.setattr(cli, "DAEMON_SOCKET", socket_path)
+        assert cli._forward_to_daemon(["fishoil"]) is False
+
+    def test_daemon_gone_after_send_is_not_retried(self, tmp_path, monkeypatch, capsys,
+                                                   start_fake_daemon):
+        socket_path = str(tmp_path / "sock")
+        start_fake_daemon(socket_path, reply=None)
+        monkeypatch.setattr(cli, "DAEMON_SOCKET", socket_path)
+        with pytest.raises(SystemExit) as exc:
+            cli._forward_to_daemon(["fishoil", "ingest", "catch", "data.json"])
+        assert exc.value.code == 1
+        assert "Not retrying" in capsys.readouterr().err
+
+    def test_wedged_daemon_times_out(self, tmp_path, monkeypatch, capsys, start_fake_daemon):
+        socket_path = str(tmp_path / "sock")
+        start_fake_daemon(socket_path, reply=b"")
+        monkeypatch.setattr(cli, "DAEMON_SOCKET", socket_path)
+        monkeypatch.setattr(cli, "DAEMON_TIMEOUT", 0.2)
+        with pytest.raises(SystemExit) as exc:
+            cli._forward_to_daemon(["fishoil"])
+        assert exc.value.code == 1
+        assert "timed out" in capsys.readouterr().err
+
+
+class TestDaemonServer:
+    def test_socket_is_private(self, tmp_path, start_daemon):
+        socket_path = str(tmp_path / "sock")
+        start_daemon(socket_path)
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    def test_survives_client_that_hangs_up(self, tmp_path, start_daemon):
+        socket_path = str(tmp_path / "sock")
+        start_daemon(socket_path)
+        request = json.dumps({"argv": ["fishoil"], "cwd": os.getcwd()}).encode() + b"\n"
+        for _ in range(3):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+                sock.sendall(request)
+        assert _raw_request(socket_path, request)["code"] == 0
+
+    def test_stalled_client_times_out(self, tmp_path, monkeypatch, start_daemon):
+        monkeypatch.setattr(cli, "DAEMON_REQUEST_TIMEOUT", 0.2)
+        socket_path = str(tmp_path / "sock")
+        start_daemon(socket_path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+            stalled.connect(socket_path)
+            request = json.dumps({"argv": ["fishoil"], "cwd": os.getcwd()}).encode() + b"\n"
+            assert _raw_request(socket_path, request)["code"] == 0
+
+    def test_oversized_request_rejected(self, tmp_path, monkeypatch, start_daemon):
+        monkeypatch.setattr(cli, "DAEMON_REQUEST_MAX_BYTES", 64)
+        socket_path = str(tmp_path / "sock")
+        start_daemon(socket_path)
+        reply = _raw_request(socket_path, b'{"argv": ["fishoil"], "pad": "' + b"x" * 100 + b'"}\n')
+        assert reply["code"] == 2
+
+    @pytest.mark.parametrize("request_line", [
+        b'{"argv": ["fishoil", "--daemon"]}\n',
+        b'{"argv": "fishoil"}\n',
+        b"[1]\n",
+    ])
+    def test_bad_requests_rejected(self, request_line):
+        reply = cli._serve_daemon_request(request_line)
+        assert reply["code"] == 2
+        assert reply["stdout"] == ""
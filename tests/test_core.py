@@ -0,0 +1,366 @@
+"""Tests for core ledger helpers."""
+
+import json
+import os
+import pytest
+
+from src.core import (
+    dual_hash, dual_hash_file, dual_hash_many, emit_receipt, emit_receipts_batch, flush_ledger, iter_ledger,
+    field_index, find_receipt, load_ledger, load_ledger_filtered, LedgerReader, validate_dual_hash,
+)
+
+
+class TestLoadLedgerFiltered:
+    def test_no_filters_returns_all(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("processing", {"batch_id": "B1"}, ledger_path=ledger)
+        assert load_ledger_filtered(ledger_path=ledger) == load_ledger(ledger)
+
+    def test_filters_combine(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("processing", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("processing", {"batch_id": "B2"}, ledger_path=ledger)
+        result = load_ledger_filtered(receipt_type="processing", batch_id="B1", ledger_path=ledger)
+        assert len(result) == 1
+        assert result[0]["receipt_type"] == "processing"
+        assert result[0]["batch_id"] == "B1"
+
+    def test_value_in_other_field_not_matched(self, ledger):
+        emit_receipt("encapsulation", {"lot_number": "LOT-A", "batch_id": "LOT-B"}, ledger_path=ledger)
+        assert load_ledger_filtered(lot_number="LOT-B", ledger_path=ledger) == []
+
+    def test_missing_ledger(self, ledger):
+        assert load_ledger_filtered(receipt_type="catch", ledger_path=ledger) == []
+
+
+class TestIterLedger:
+    def test_matches_load_ledger(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("processing", {"batch_id": "B1"}, ledger_path=ledger)
+        assert list(iter_ledger(ledger)) == load_ledger(ledger)
+
+    def test_missing_ledger(self, ledger):
+        assert list(iter_ledger(ledger)) == []
+
+
+class TestDualHashMany:
+    def test_matches_dual_hash(self):
+        blobs = [b"a", "b", b""]
+        assert dual_hash_many(blobs) == [dual_hash(b) for b in blobs]
+
+
+class TestDualHashUncached:
+    def test_matches_dual_hash_without_caching(self):
+        from src.core import _dual_hash_cached, dual_hash_uncached
+        before = _dual_hash_cached.cache_info().currsize
+        assert dual_hash_uncached(b"one-off body") == dual_hash(b"one-off body")
+        assert dual_hash_uncached("one-off body") == dual_hash(b"one-off body")
+        assert _dual_hash_cached.cache_info().currsize == before + 1
+
+    def test_cache_pins_bounded_memory(self):
+        from src.core import DUAL_HASH_CACHE_MAX_BYTES, _dual_hash_cached
+        before = _dual_hash_cached.cache_info().currsize
+        dual_hash(b"x" * (DUAL_HASH_CACHE_MAX_BYTES + 1))
+        assert _dual_hash_cached.cache_info().currsize == before
+        assert _dual_hash_cached.cache_info().maxsize * DUAL_HASH_CACHE_MAX_BYTES <= 1024 * 1024
+
+
+class TestLedgerHandles:
+    def test_appends_visible_without_flush(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        assert [r["batch_id"] for r in load_ledger(ledger)] == ["B1", "B2"]
+
+    def test_recreated_ledger_after_flush(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        flush_ledger(ledger)
+        os.unlink(ledger)
+        emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        assert [r["batch_id"] for r in load_ledger(ledger)] == ["B2"]
+
+    def test_unlinked_ledger_without_flush(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        os.unlink(ledger)
+        emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        assert [r["batch_id"] for r in load_ledger(ledger)] == ["B2"]
+
+    def test_rotated_ledger_without_flush(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        os.rename(ledger, ledger + ".1")
+        emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        assert [r["batch_id"] for r in load_ledger(ledger + ".1")] == ["B1"]
+        assert [r["batch_id"] for r in load_ledger(ledger)] == ["B2"]
+
+
+class TestEmitReceiptsBatch:
+    def test_matches_ledger_lines(self, ledger):
+        receipts = emit_receipts_batch([
+            ("anomaly", {"n": 1}, None),
+            ("anomaly", {"n": 2}, "tenant-b"),
+        ], ledger_path=ledger)
+        assert load_ledger(ledger) == receipts
+        assert [r["tenant_id"] for r in receipts] == ["fishoilproof-demo", "tenant-b"]
+        for r in receipts:
+            body = {k: v for k, v in r.items() if k not in ("payload_hash", "merkle_root")}
+            assert r["payload_hash"] == dual_hash(json.dumps(body, sort_keys=True, default=str))
+
+    def test_empty_batch_writes_nothing(self, ledger):
+        assert emit_receipts_batch([], ledger_path=ledger) == []
+        assert not os.path.exists(ledger)
+
+
+class TestFieldIndex:
+    def test_picks_up_appends(self, ledger):
+        assert field_index("encapsulation", "lot_number", ledger) == {}
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        emit_receipt("distribution", {"lot_number": "LOT-2"}, ledger_path=ledger)
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1"]
+        emit_receipt("encapsulation", {"lot_number": "LOT-2"}, ledger_path=ledger)
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1", "LOT-2"]
+
+    def test_rebuilt_after_ledger_replaced(self, ledger):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        assert "LOT-1" in field_index("encapsulation", "lot_number", ledger)
+        flush_ledger(ledger)
+        os.unlink(ledger)
+        assert field_index("encapsulation", "lot_number", ledger) == {}
+
+    def test_flush_ledger_drops_index(self, ledger):
+        from src.core import _FIELD_INDEXES
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        field_index("encapsulation", "lot_number", ledger)
+        assert any(k[0] == os.path.abspath(ledger) for k in _FIELD_INDEXES)
+        flush_ledger(ledger)
+        assert not any(k[0] == os.path.abspath(ledger) for k in _FIELD_INDEXES)
+
+    def test_index_count_is_capped(self, tmp_path, monkeypatch):
+        from src import core
+        monkeypatch.setattr(core, "FIELD_INDEXES_MAX", 2)
+        paths = [str(tmp_path / f"l{i}.jsonl") for i in range(4)]
+        for path in paths:
+            emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=path)
+            assert "LOT-1" in field_index("encapsulation", "lot_number", path)
+        assert len(core._FIELD_INDEXES) == 2
+        assert (os.path.abspath(paths[-1]), "encapsulation", "lot_number") in core._FIELD_INDEXES
+        for path in paths:
+            flush_ledger(path)
+
+    def test_rebuilt_after_growing_rewrite_in_place(self, ledger):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1"]
+        with open(ledger, "r+b") as f:
+            line = f.read()
+            f.seek(0)
+            f.write(line.replace(b'"LOT-1"', b'"LOT-1-RENAMED"'))
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1-RENAMED"]
+
+    def test_rebuilt_after_same_size_rewrite(self, ledger):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1"]
+        st = os.stat(ledger)
+        with open(ledger, "r+b") as f:
+            line = f.read()
+            f.seek(0)
+            f.write(line.replace(b'"LOT-1"', b'"LOT-9"'))
+        # Coarse filesystem clocks can leave mtime unchanged; make the edit visible
+        os.utime(ledger, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-9"]
+        emit_receipt("encapsulation", {"lot_number": "LOT-9"}, ledger_path=ledger)
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-9"]
+
+    def test_ignores_partial_last_line(self, ledger):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        flush_ledger(ledger)
+        with open(ledger, "ab") as f:
+            f.write(b'{"receipt_type": "encapsulation", "lot_number": "LOT-2"')
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1"]
+        with open(ledger, "ab") as f:
+            f.write(b"}\n")
+        assert list(field_index("encapsulation", "lot_number", ledger)) == ["LOT-1", "LOT-2"]
+
+
+class TestFindReceipt:
+    def test_last_line_without_newline(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        last = emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        flush_ledger(ledger)
+        with open(ledger, "rb+") as f:
+            f.truncate(os.path.getsize(ledger) - 1)  # drop the final "\n"
+        assert find_receipt("catch", "batch_id", "B2", ledger_path=ledger) == last
+        assert find_receipt("catch", "batch_id", "B1", ledger_path=ledger)["batch_id"] == "B1"
+        assert find_receipt("catch", "batch_id", "B3", ledger_path=ledger) is None
+
+    def test_partial_last_line_is_not_a_match(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        flush_ledger(ledger)
+        with open(ledger, "ab") as f:
+            f.write(b'{"receipt_type": "catch", "batch_id": "B2"')
+        assert find_receipt("catch", "batch_id", "B2", ledger_path=ledger) is None
+
+    def test_first_match_after_appends(self, ledger):
+        assert find_receipt("catch", "batch_id", "B1", ledger_path=ledger) is None
+        first = emit_receipt("catch", {"batch_id": "B1", "n": 1}, ledger_path=ledger)
+        emit_receipt("processing", {"batch_id": "B1"}, ledger_path=ledger)
+        assert find_receipt("catch", "batch_id", "B1", ledger_path=ledger) == first
+        emit_receipt("catch", {"batch_id": "B1", "n": 2}, ledger_path=ledger)
+        second = emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        assert find_receipt("catch", "batch_id", "B1", ledger_path=ledger) == first
+        assert find_receipt("catch", "batch_id", "B2", ledger_path=ledger) == second
+
+    def test_ledger_rewritten_in_place(self, ledger):
+        emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("catch", {"batch_id": "B2"}, ledger_path=ledger)
+        assert find_receipt("catch", "batch_id", "B2", ledger_path=ledger)["batch_id"] == "B2"
+        flush_ledger(ledger)
+        with open(ledger, "r+b") as f:
+            lines = f.readlines()
+            f.seek(0)
+            f.write(lines[0].replace(b'"B1"', b'"B1-LONGER"') + lines[1])
+        assert find_receipt("catch", "batch_id", "B2", ledger_path=ledger)["batch_id"] == "B2"
+
+    def test_non_string_value(self, ledger):
+        receipt = emit_receipt("catch", {"n": 7}, ledger_path=ledger)
+        assert find_receipt("catch", "n", 7, ledger_path=ledger) == receipt
+
+
+class TestLedgerParsing:
+    def test_round_trip_preserves_hash(self, ledger):
+        from src.chain import verify_single_receipt
+        emit_receipt("catch", {"big": 2 ** 70, "ratio": 0.147, "name": "Año"}, ledger_path=ledger)
+        (receipt,) = load_ledger(ledger)
+        assert receipt["big"] == 2 ** 70
+        assert verify_single_receipt(receipt)
+
+    def test_ledger_line_matches_returned_receipt(self, ledger):
+        from src.chain import verify_single_receipt
+        emitted = emit_receipt("catch", {"nested": {"b": [1, 2], "a": "q\"uote"}}, ledger_path=ledger)
+        (receipt,) = load_ledger(ledger)
+        assert receipt == emitted
+        assert verify_single_receipt(receipt)
+
+
+class TestDualHashLarge:
+    def test_parallel_path_matches_serial(self, monkeypatch):
+        import hashlib
+        import blake3
+        data = os.urandom(2 * 1024 * 1024)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        expected = f"SHA256_{hashlib.sha256(data).hexdigest()}:BLAKE3_{blake3.blake3(data).hexdigest()}"
+        assert dual_hash(data) == expected
+
+    def test_large_file_matches_bytes(self, monkeypatch, tmp_path):
+        data = os.urandom(2 * 1024 * 1024 + 7)
+        path = tmp_path / "cert.pdf"
+        path.write_bytes(data)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        assert dual_hash_file(str(path)) == dual_hash(data)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_parallel_path_after_fork(self, monkeypatch):
+        import signal
+        from src.core import _hash_pool
+        data = os.urandom(2 * 1024 * 1024)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        expected = dual_hash(data)  # starts the pool's worker thread in this process
+        assert _hash_pool()._threads
+        pid = os.fork()
+        if pid == 0:
+            signal.alarm(10)  # a dead inherited pool would block forever
+            os._exit(0 if dual_hash(data) == expected else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+
+class TestLedgerReader:
+    def test_find_by_hash_skips_previous_hash_mentions(self, ledger):
+        first = emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        emit_receipt("processing", {"previous_hash": first["payload_hash"]}, ledger_path=ledger)
+        with LedgerReader(ledger) as reader:
+            assert reader.find(payload_hash=first["payload_hash"]) == first
+
+    def test_find_first_match_on_all_fields(self, ledger):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        first = emit_receipt("distribution", {"lot_number": "LOT-1", "n": 1}, ledger_path=ledger)
+        emit_receipt("distribution", {"lot_number": "LOT-1", "n": 2}, ledger_path=ledger)
+        with LedgerReader(ledger) as reader:
+            assert reader.find(lot_number="LOT-1", receipt_type="distribution") == first
+            assert reader.find(lot_number="LOT-2", receipt_type="distribution") is None
+
+    def test_missing_ledger(self, ledger):
+        with LedgerReader(ledger) as reader:
+            assert reader.find(payload_hash="x") is None
+
+
+class TestCanonicalJson:
+    def test_matches_sorted_json_dumps(self):
+        import json
+        from datetime import date
+        from src.core import canonical_json
+        obj = {"b": [1, 2.5, None], "a": {"z": "é", "y": True}, "d": date(2025, 1, 31)}
+        assert canonical_json(obj) == json.dumps(obj, sort_keys=True, default=str)
+
+
+class TestDumpsJson:
+    @pytest.mark.parametrize("indent", [False, True])
+    def test_big_int_and_nan_match_stdlib(self, indent):
+        from src.core import dumps_json
+        obj = {"big": 2 ** 64, "nan": float("nan"), "nested": [{"inf": float("inf")}]}
+        out = json.loads(dumps_json(obj, indent=indent))
+        assert out["big"] == 2 ** 64
+        assert out["nan"] != out["nan"]
+        assert out["nested"] == [{"inf": float("inf")}]
+
+    def test_big_int_in_list(self):
+        from src.core import dumps_json
+        assert json.loads(dumps_json([1, 2 ** 70])) == [1, 2 ** 70]
+
+    def test_orjson_output_differs_from_stdlib_text(self):
+        pytest.importorskip("orjson")
+        from datetime import datetime, timezone
+        from src.core import dumps_json
+        obj = {"ts": datetime(2025, 1, 31, 14, 22, 47, tzinfo=timezone.utc), "site": "Ålesund"}
+        assert dumps_json(obj) == '{"ts":"2025-01-31T14:22:47+00:00","site":"Ålesund"}'
+
+    def test_stdlib_fallback_text(self, monkeypatch):
+        import src.core
+        from datetime import datetime, timezone
+        monkeypatch.setattr(src.core, "HAS_ORJSON", False)
+        obj = {"ts": datetime(2025, 1, 31, 14, 22, 47, tzinfo=timezone.utc), "site": "Ålesund"}
+        assert src.core.dumps_json(obj) == '{"ts": "2025-01-31 14:22:47+00:00", "site": "\\u00c5lesund"}'
+
+
+class TestMerkleOptOut:
+    def test_disabled_merkle_root_is_null(self, ledger, monkeypatch):
+        import src.core
+        from src.chain import verify_single_receipt
+        monkeypatch.setattr(src.core, "ENABLE_MERKLE_ROOT", False)
+        emitted = emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        (receipt,) = load_ledger(ledger)
+        assert emitted["merkle_root"] is None
+        assert receipt == emitted
+        assert verify_single_receipt(receipt)
+
+
+class TestReceiptTimestamp:
+    def test_iso8601_utc_with_microseconds(self, ledger):
+        from datetime import datetime, timezone
+        receipt = emit_receipt("catch", {"batch_id": "B1"}, ledger_path=ledger)
+        ts = datetime.fromisoformat(receipt["ts"])
+        assert ts.tzinfo == timezone.utc
+        assert abs((datetime.now(timezone.utc) - ts).total_seconds()) < 5
+        assert len(receipt["ts"]) == len("2025-01-31T14:22:47.000000+00:00")
+
+
+class TestValidateDualHash:
+    def test_accepts_dual_hash_output(self):
+        assert validate_dual_hash(dual_hash(b"cert.pdf"))
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "abc:def",
+        "SHA256_" + "a" * 64 + ":BLAKE3_" + "a" * 63,
+        "SHA256_" + "A" * 64 + ":BLAKE3_" + "a" * 64,
+        "SHA256_" + "a" * 64 + ":BLAKE3_" + "a" * 64 + "\n",
+    ])
+    def test_rejects_malformed(self, value):
+        assert not validate_dual_hash(value)
@@ -1,29 +1,19 @@
 """Tests for Stage 5: Distribution Receipt."""
 
-import os
-import tempfile
 import pytest
 
+import src.distribution
 from src.core import dual_hash
 from src.distribution import (
     create_distribution_receipt,
     validate_cold_chain,
     COLD_CHAIN_TARGET_MAX,
     COLD_CHAIN_MAX_DEVIATIONS,
+    NUMPY_MIN_READINGS,
 )
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def previous_hash():
     return dual_hash(b"previous_encapsulation_receipt")
 
@@ -61,6 +51,11 @@ class TestValidateColdChain:
         assert result["enabled"] is False
         assert result["cold_chain_pass"] is False
 
+    def test_no_temps(self):
+        result = validate_cold_chain(None, 90)
+        assert result["enabled"] is False
+        assert result["duration_days"] == 90
+
     def test_with_temp_log_hash(self):
         temps = [2.1, 2.3]
         h = dual_hash(b"temp_log.csv")
@@ -72,6 +67,46 @@ class TestValidateColdChain:
         result = validate_cold_chain(temps, 90)
         assert result["deviations_count"] == 1
 
+    def test_long_temperature_log(self):
+        temps = [2.5, 3.5] * 500 + [1.0, 9.0]
+        result = validate_cold_chain(temps, 90)
+        assert result["avg_temp_c"] == pytest.approx(3.0, abs=0.01)
+        assert result["min_temp_c"] == 1.0
+        assert result["max_temp_c"] == 9.0
+        assert result["deviations_count"] == 2
+        assert result["cold_chain_pass"] is False
+
+    def test_short_ndarray_log(self):
+        np = pytest.importorskip("numpy")
+        temps = [2.1, 2.3, 12.0, 2.2, 2.1]
+        result = validate_cold_chain(np.array(temps), 90)
+        assert result == validate_cold_chain(temps, 90)
+        assert type(result["max_temp_c"]) is float
+        assert type(result["deviations_count"]) is int
+
+    @pytest.mark.parametrize("temps", [
+        [4] * (NUMPY_MIN_READINGS - 2) + [1, 9],
+        [4.5] * (NUMPY_MIN_READINGS - 2) + [1, 9],
+        [float("nan")] + [4.5] * (NUMPY_MIN_READINGS - 1),
+        [4.5] * (NUMPY_MIN_READINGS - 2) + [float("nan"), 9.0],
+    ])
+    def test_numpy_threshold_matches_python_path(self, temps, monkeypatch):
+        pytest.importorskip("numpy")
+        result = validate_cold_chain(temps, 90)
+        monkeypatch.setattr(src.distribution, "HAS_NUMPY", False)
+        expected = validate_cold_chain(temps, 90)
+        assert repr(result) == repr(expected)
+
+    def test_large_float32_feed(self):
+        np = pytest.importorskip("numpy")
+        temps = np.random.default_rng(0).normal(5.0, 1.5, 100_000).astype(np.float32)
+        result = validate_cold_chain(temps, 90)
+        expected = int(np.count_nonzero((temps < 2.0) | (temps > 8.0)))
+        assert result["deviations_count"] == expected > 0
+        assert result["max_temp_c"] == round(float(temps.max()), 2)
+        assert result["min_temp_c"] == round(float(temps.min()), 2)
+        assert result["cold_chain_pass"] is False
+
 
 class TestCreateDistributionReceipt:
     def test_basic_receipt_no_cold_chain(self, ledger, previous_hash):
@@ -89,6 +124,21 @@ class TestCreateDistributionReceipt:
         assert receipt["cold_chain"]["enabled"] is False
         assert "payload_hash" in receipt
 
+    def test_untracked_cold_chain_not_shared(self, ledger, previous_hash):
+        kwargs = dict(
+            distributor_id="DIST-01",
+            distributor_name="Test Dist",
+            warehouse_id="WH-01",
+            warehouse_location="Test City",
+            cold_chain_data=None,
+            previous_hash=previous_hash,
+            ledger_path=ledger,
+        )
+        first = create_distribution_receipt(lot_number="LOT-TEST-001", **kwargs)
+        first["cold_chain"]["enabled"] = True
+        second = create_distribution_receipt(lot_number="LOT-TEST-002", **kwargs)
+        assert second["cold_chain"]["enabled"] is False
+
     def test_receipt_with_cold_chain(self, ledger, previous_hash):
         cold_chain = validate_cold_chain([2.1, 2.3, 2.0], 90)
         receipt = create_distribution_receipt(
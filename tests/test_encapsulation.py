@@ -1,7 +1,8 @@
 """Tests for Stage 4: Encapsulation Receipt."""
 
 import os
-import tempfile
+from datetime import datetime, timezone
+
 import pytest
 
 from src.core import dual_hash, StopRule
@@ -11,22 +12,12 @@ from src.encapsulation import (
 )
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def cert_hash():
     return dual_hash(b"test_facility_cert.pdf")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def previous_hash():
     return dual_hash(b"previous_testing_receipt")
 
@@ -46,6 +37,11 @@ class TestGenerateLotNumber:
         lot = generate_lot_number("A")
         assert lot.endswith("XX")
 
+    def test_uses_current_utc_date(self):
+        lot = generate_lot_number("BP-2025-0130")
+        today = datetime.now(timezone.utc)
+        assert lot == f"LOT-{today.year}-{today.month:02d}{today.day:02d}-30"
+
 
 class TestCreateEncapsulationReceipt:
     def test_basic_receipt(self, ledger, cert_hash, previous_hash):
@@ -100,6 +96,69 @@ class TestCreateEncapsulationReceipt:
                 ledger_path=ledger,
             )
 
+    def test_duplicate_non_string_lot_raises(self, ledger, cert_hash, previous_hash):
+        kwargs = dict(
+            facility_id="BOT-01",
+            facility_name="Test",
+            facility_cert_type="NSF",
+            facility_cert_id="NSF-001",
+            facility_cert_hash=cert_hash,
+            lot_number=20250131,
+            fill_date="2025-01-31T14:00:00Z",
+            batch_id="BP-INT",
+            capsule_count=90,
+            mg_per_capsule=1000.0,
+            previous_hash=previous_hash,
+            ledger_path=ledger,
+        )
+        create_encapsulation_receipt(**kwargs)
+        with pytest.raises(StopRule, match="already exists"):
+            create_encapsulation_receipt(**kwargs)
+
+    def test_duplicate_of_unterminated_last_line_raises(self, ledger, cert_hash, previous_hash):
+        kwargs = dict(
+            facility_id="BOT-01",
+            facility_name="Test",
+            facility_cert_type="NSF",
+            facility_cert_id="NSF-001",
+            facility_cert_hash=cert_hash,
+            lot_number="LOT-TAIL",
+            fill_date="2025-01-31T14:00:00Z",
+            batch_id="BP-TAIL",
+            capsule_count=90,
+            mg_per_capsule=1000.0,
+            previous_hash=previous_hash,
+            ledger_path=ledger,
+        )
+        create_encapsulation_receipt(**kwargs)
+        with open(ledger, "rb+") as f:
+            f.truncate(os.path.getsize(ledger) - 1)  # drop the final newline
+        with pytest.raises(StopRule, match="already exists"):
+            create_encapsulation_receipt(**kwargs)
+
+    def test_lot_renamed_in_place_is_free_again(self, ledger, cert_hash, previous_hash):
+        kwargs = dict(
+            facility_id="BOT-01",
+            facility_name="Test",
+            facility_cert_type="NSF",
+            facility_cert_id="NSF-001",
+            facility_cert_hash=cert_hash,
+            lot_number="LOT-1",
+            fill_date="2025-01-31T14:00:00Z",
+            batch_id="BP-REN",
+            capsule_count=90,
+            mg_per_capsule=1000.0,
+            previous_hash=previous_hash,
+            ledger_path=ledger,
+        )
+        create_encapsulation_receipt(**kwargs)
+        with open(ledger, "r+b") as f:
+            data = f.read()
+            f.seek(0)
+            f.write(data.replace(b'"LOT-1"', b'"LOT-1-RENAMED"'))
+        receipt = create_encapsulation_receipt(**kwargs)
+        assert receipt["lot_number"] == "LOT-1"
+
     def test_invalid_cert_type_raises(self, ledger, cert_hash, previous_hash):
         with pytest.raises(StopRule, match="Invalid facility cert type"):
             create_encapsulation_receipt(
@@ -134,6 +193,24 @@ class TestCreateEncapsulationReceipt:
                 ledger_path=ledger,
             )
 
+    def test_truncated_cert_hash_raises(self, ledger, cert_hash, previous_hash):
+        with pytest.raises(StopRule, match="dual-hash format"):
+            create_encapsulation_receipt(
+                facility_id="BOT-01",
+                facility_name="Test",
+                facility_cert_type="NSF",
+                facility_cert_id="X",
+                facility_cert_hash=cert_hash[:-1],
+                lot_number="LOT-TEST",
+                fill_date="2025-01-31T14:00:00Z",
+                batch_id="BP-TEST",
+                capsule_count=90,
+                mg_per_capsule=1000.0,
+                previous_hash=previous_hash,
+                ledger_path=ledger,
+            )
+        assert not os.path.exists(ledger)
+
     def test_bad_fill_date_raises(self, ledger, cert_hash, previous_hash):
         with pytest.raises(StopRule, match="Invalid fill_date"):
             create_encapsulation_receipt(
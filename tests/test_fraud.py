@@ -1,10 +1,8 @@
 """Tests for Fraud Detection Algorithms."""
 
-import os
-import tempfile
 import pytest
 
-from src.core import dual_hash
+from src.core import dual_hash, load_ledger_filtered
 from src.catch import create_catch_receipt
 from src.processing import create_processing_receipt
 from src.testing import create_testing_receipt
@@ -19,36 +17,39 @@ from src.fraud import (
 )
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
+# Fields shared by every helper-built receipt of each type; helpers merge in the rest
+_PROCESSING_BASE = {
+    "receipt_type": "processing",
+    "tenant_id": "test",
+    "yield_input_kg": 1000,
+    "yield_expected_min": 0.12,
+    "yield_expected_max": 0.18,
+    "payload_hash": dual_hash(b"test_processing"),
+}
+_TESTING_BASE = {
+    "receipt_type": "testing",
+    "tenant_id": "test",
+    "payload_hash": dual_hash(b"test_testing"),
+}
+_DISTRIBUTION_BASE = {
+    "receipt_type": "distribution",
+    "tenant_id": "test",
+    "payload_hash": dual_hash(b"test_distribution"),
+}
 
 
 def _make_processing_receipt(yield_status, yield_ratio, ledger_path):
     """Helper to make a processing receipt with specific yield."""
-    return {
-        "receipt_type": "processing",
-        "tenant_id": "test",
+    return _PROCESSING_BASE | {
         "yield_status": yield_status,
         "yield_ratio": yield_ratio,
-        "yield_input_kg": 1000,
         "yield_output_kg": yield_ratio * 1000,
-        "yield_expected_min": 0.12,
-        "yield_expected_max": 0.18,
-        "payload_hash": dual_hash(b"test_processing"),
     }
 
 
 def _make_testing_receipt(potency_pass, total_mg, label_mg, contaminants_pass=True):
     """Helper to make a testing receipt."""
-    return {
-        "receipt_type": "testing",
-        "tenant_id": "test",
+    return _TESTING_BASE | {
         "potency": {
             "potency_pass": potency_pass,
             "total_omega3_mg": total_mg,
@@ -65,22 +66,18 @@ def _make_testing_receipt(potency_pass, total_mg, label_mg, contaminants_pass=Tr
             "pcbs_ppm": 0.03,
             "dioxins_pg_per_g": 1.2,
         },
-        "payload_hash": dual_hash(b"test_testing"),
     }
 
 
 def _make_distribution_receipt(enabled, max_temp, deviations):
     """Helper to make a distribution receipt."""
-    return {
-        "receipt_type": "distribution",
-        "tenant_id": "test",
+    return _DISTRIBUTION_BASE | {
         "cold_chain": {
             "enabled": enabled,
             "max_temp_c": max_temp,
             "avg_temp_c": max_temp - 1 if max_temp else None,
             "deviations_count": deviations,
         },
-        "payload_hash": dual_hash(b"test_distribution"),
     }
 
 
@@ -188,3 +185,11 @@ class TestRunAllFraudChecks:
         assert "YIELD_HIGH" in types
         assert "LABEL_FRAUD" in types
         assert "COLD_CHAIN_DEGRADATION" in types
+
+    def test_anomalies_appended_to_ledger(self, ledger):
+        chain = [
+            _make_processing_receipt("HIGH_DILUTION_FLAG", 0.22, ledger),
+            _make_testing_receipt(False, 600, 700),
+        ]
+        anomalies = run_all_fraud_checks(chain, ledger_path=ledger)
+        assert load_ledger_filtered(receipt_type="anomaly", ledger_path=ledger) == anomalies
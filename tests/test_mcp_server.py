@@ -0,0 +1,93 @@
+"""Tests for the MCP server's chain cache and stdio loop."""
+
+import io
+import json
+from collections import OrderedDict
+
+import pytest
+
+import mcp_server
+from src.core import emit_receipt
+
+
+@pytest.fixture
+def verify_calls(monkeypatch):
+    """Count verify_chain calls made through the cache."""
+    calls = []
+    real_verify = mcp_server.verify_chain
+
+    def counting_verify(lot_number, ledger_path=None):
+        calls.append(lot_number)
+        return real_verify(lot_number, ledger_path=ledger_path)
+
+    monkeypatch.setattr(mcp_server, "verify_chain", counting_verify)
+    monkeypatch.setattr(mcp_server, "_CHAIN_CACHE", OrderedDict())
+    return calls
+
+
+class TestCachedVerify:
+    def test_hit_while_ledger_unchanged(self, ledger, verify_calls):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        first = mcp_server._cached_verify("LOT-1", ledger_path=ledger)
+        assert mcp_server._cached_verify("LOT-1", ledger_path=ledger) == first
+        assert verify_calls == ["LOT-1"]
+
+    def test_append_invalidates(self, ledger, verify_calls):
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        mcp_server._cached_verify("LOT-1", ledger_path=ledger)
+        emit_receipt("distribution", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        result = mcp_server._cached_verify("LOT-1", ledger_path=ledger)
+        assert verify_calls == ["LOT-1", "LOT-1"]
+        assert "distribution" in result["receipts"]
+
+    def test_callers_get_copies(self, ledger, verify_calls):
+        emit_receipt("distribution", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        emit_receipt("encapsulation", {"lot_number": "LOT-1"}, ledger_path=ledger)
+        first = mcp_server._cached_verify("LOT-1", ledger_path=ledger)
+        expected_errors = list(first["errors"])
+        first["errors"].append("mutated")
+        first["receipts"].clear()
+        second = mcp_server._cached_verify("LOT-1", ledger_path=ledger)
+        assert second["errors"] == expected_errors
+        assert set(second["receipts"]) == {"distribution", "encapsulation"}
+        assert verify_calls == ["LOT-1"]
+
+
+class _ChunkedStream:
+    """Binary stdin stand-in whose read1() returns the given chunks in turn."""
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def read1(self, size):
+        return self._chunks.pop(0) if self._chunks else b""
+
+
+def _serve(chunks) -> list[dict]:
+    out = io.BytesIO()
+    mcp_server._serve_stdio(_ChunkedStream(chunks), out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestServeStdio:
+    def test_batch_answered_in_order(self):
+        responses = _serve([b'{"method": "tools/list"}\n{"method": "nope"}\n'])
+        assert len(responses[0]["tools"]) == len(mcp_server.MCP_TOOLS)
+        assert responses[1] == {"error": "Unknown method: nope"}
+
+    def test_bad_request_does_not_drop_batch(self):
+        responses = _serve([
+            b'{"method": "tools/list"}\n[1, 2]\nnot json\n'
+            b'{"method": "tools/call", "params": "oops"}\n{"method": "nope"}\n'
+        ])
+        assert len(responses) == 5
+        assert "tools" in responses[0]
+        assert "error" in responses[1]
+        assert responses[2] == {"error": "Invalid JSON"}
+        assert "error" in responses[3]
+        assert responses[4] == {"error": "Unknown method: nope"}
+
+    def test_request_split_across_reads(self):
+        responses = _serve([b'{"method": "no', b'pe"}\n\n{"method": ', b'"tools/list"}'])
+        assert responses[0] == {"error": "Unknown method: nope"}
+        assert "tools" in responses[1]
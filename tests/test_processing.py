@@ -1,7 +1,5 @@
 """Tests for Stage 2: Processing Receipt."""
 
-import os
-import tempfile
 import pytest
 
 from src.core import dual_hash, StopRule
@@ -13,57 +11,48 @@ from src.processing import (
 )
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
+# Tolerance for yield-ratio assertions (ratios are output/input, e.g. 147/1000)
+_YIELD_TOL = dict(abs=0.001)
+
+# create_processing_receipt arguments shared by the receipt tests; each test
+# overrides only what it exercises and passes hashes and ledger itself
+BASE_PROCESSING = dict(
+    facility_id="FAC-01",
+    facility_name="Test",
+    gmp_cert_type="NSF",
+    gmp_cert_id="X",
+    batch_id="BP-TEST",
+    extraction_method="MolecularDistillation",
+    extraction_temp_c=240.0,
+    yield_input_kg=1000.0,
+    yield_output_kg=147.0,
+)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def gmp_hash():
     return dual_hash(b"test_gmp_cert.pdf")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def previous_hash():
     return dual_hash(b"previous_catch_receipt")
 
 
 class TestValidateYield:
-    def test_normal_yield(self):
-        ratio, status = validate_yield(1000, 147)
-        assert ratio == pytest.approx(0.147, abs=0.001)
-        assert status == "NORMAL"
-
-    def test_low_yield(self):
-        ratio, status = validate_yield(1000, 100)
-        assert ratio == pytest.approx(0.1, abs=0.001)
-        assert status == "LOW"
-
-    def test_high_yield_dilution(self):
-        ratio, status = validate_yield(1000, 220)
-        assert ratio == pytest.approx(0.22, abs=0.001)
-        assert status == "HIGH_DILUTION_FLAG"
-
-    def test_boundary_low(self):
-        ratio, status = validate_yield(1000, 120)
-        assert status == "NORMAL"
-
-    def test_boundary_high(self):
-        ratio, status = validate_yield(1000, 180)
-        assert status == "NORMAL"
-
-    def test_just_below_min(self):
-        ratio, status = validate_yield(1000, 119)
-        assert status == "LOW"
-
-    def test_just_above_max(self):
-        ratio, status = validate_yield(1000, 181)
-        assert status == "HIGH_DILUTION_FLAG"
+    @pytest.mark.parametrize("output_kg,expected_ratio,expected_status", [
+        (147, 0.147, "NORMAL"),
+        (100, 0.100, "LOW"),
+        (220, 0.220, "HIGH_DILUTION_FLAG"),
+        (120, 0.120, "NORMAL"),              # boundary low
+        (180, 0.180, "NORMAL"),              # boundary high
+        (119, 0.119, "LOW"),                 # just below min
+        (181, 0.181, "HIGH_DILUTION_FLAG"),  # just above max
+    ])
+    def test_yield_status(self, output_kg, expected_ratio, expected_status):
+        ratio, status = validate_yield(1000, output_kg)
+        assert ratio == pytest.approx(expected_ratio, **_YIELD_TOL)
+        assert status == expected_status
 
     def test_zero_input_raises(self):
         with pytest.raises(StopRule, match="Invalid yield values"):
@@ -76,109 +65,59 @@ class TestValidateYield:
 
 class TestCreateProcessingReceipt:
     def test_basic_receipt(self, ledger, gmp_hash, previous_hash):
+        kwargs = BASE_PROCESSING | dict(
+            facility_name="Test Facility", gmp_cert_id="NSF-001", batch_id="BP-2025-TEST",
+        )
         receipt = create_processing_receipt(
-            facility_id="FAC-01",
-            facility_name="Test Facility",
-            gmp_cert_type="NSF",
-            gmp_cert_id="NSF-001",
-            gmp_cert_hash=gmp_hash,
-            batch_id="BP-2025-TEST",
-            extraction_method="MolecularDistillation",
-            extraction_temp_c=240.0,
-            yield_input_kg=1000.0,
-            yield_output_kg=147.0,
-            previous_hash=previous_hash,
-            ledger_path=ledger,
+            **kwargs, gmp_cert_hash=gmp_hash, previous_hash=previous_hash, ledger_path=ledger,
         )
         assert receipt["receipt_type"] == "processing"
         assert receipt["facility_id"] == "FAC-01"
-        assert receipt["yield_ratio"] == pytest.approx(0.147, abs=0.001)
+        assert receipt["yield_ratio"] == pytest.approx(0.147, **_YIELD_TOL)
         assert receipt["yield_status"] == "NORMAL"
         assert receipt["previous_hash"] == previous_hash
         assert "payload_hash" in receipt
 
     def test_dilution_flag(self, ledger, gmp_hash, previous_hash):
-        receipt = create_processing_receipt(
-            facility_id="FAC-01",
-            facility_name="Test Facility",
-            gmp_cert_type="NSF",
-            gmp_cert_id="NSF-001",
-            gmp_cert_hash=gmp_hash,
-            batch_id="BP-2025-DIL",
-            extraction_method="MolecularDistillation",
-            extraction_temp_c=240.0,
-            yield_input_kg=1000.0,
+        kwargs = BASE_PROCESSING | dict(
+            facility_name="Test Facility", gmp_cert_id="NSF-001", batch_id="BP-2025-DIL",
             yield_output_kg=220.0,
-            previous_hash=previous_hash,
-            ledger_path=ledger,
+        )
+        receipt = create_processing_receipt(
+            **kwargs, gmp_cert_hash=gmp_hash, previous_hash=previous_hash, ledger_path=ledger,
         )
         assert receipt["yield_status"] == "HIGH_DILUTION_FLAG"
 
-    def test_invalid_gmp_type_raises(self, ledger, gmp_hash, previous_hash):
+    def test_invalid_gmp_type_raises(self, null_ledger, gmp_hash, previous_hash):
+        kwargs = BASE_PROCESSING | dict(gmp_cert_type="INVALID")
         with pytest.raises(StopRule, match="Invalid GMP cert type"):
             create_processing_receipt(
-                facility_id="FAC-01",
-                facility_name="Test",
-                gmp_cert_type="INVALID",
-                gmp_cert_id="X",
-                gmp_cert_hash=gmp_hash,
-                batch_id="BP-TEST",
-                extraction_method="MolecularDistillation",
-                extraction_temp_c=240.0,
-                yield_input_kg=1000.0,
-                yield_output_kg=147.0,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
+                **kwargs, gmp_cert_hash=gmp_hash, previous_hash=previous_hash,
+                ledger_path=null_ledger,
             )
 
-    def test_invalid_extraction_method_raises(self, ledger, gmp_hash, previous_hash):
+    def test_invalid_extraction_method_raises(self, null_ledger, gmp_hash, previous_hash):
+        kwargs = BASE_PROCESSING | dict(extraction_method="MagicExtraction")
         with pytest.raises(StopRule, match="Invalid extraction method"):
             create_processing_receipt(
-                facility_id="FAC-01",
-                facility_name="Test",
-                gmp_cert_type="NSF",
-                gmp_cert_id="X",
-                gmp_cert_hash=gmp_hash,
-                batch_id="BP-TEST",
-                extraction_method="MagicExtraction",
-                extraction_temp_c=240.0,
-                yield_input_kg=1000.0,
-                yield_output_kg=147.0,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
+                **kwargs, gmp_cert_hash=gmp_hash, previous_hash=previous_hash,
+                ledger_path=null_ledger,
             )
 
-    def test_bad_gmp_hash_format_raises(self, ledger, previous_hash):
+    def test_bad_gmp_hash_format_raises(self, null_ledger, previous_hash):
         with pytest.raises(StopRule, match="dual-hash format"):
             create_processing_receipt(
-                facility_id="FAC-01",
-                facility_name="Test",
-                gmp_cert_type="NSF",
-                gmp_cert_id="X",
-                gmp_cert_hash="not_a_dual_hash",
-                batch_id="BP-TEST",
-                extraction_method="MolecularDistillation",
-                extraction_temp_c=240.0,
-                yield_input_kg=1000.0,
-                yield_output_kg=147.0,
+                **BASE_PROCESSING, gmp_cert_hash="not_a_dual_hash",
                 previous_hash=previous_hash,
-                ledger_path=ledger,
+                ledger_path=null_ledger,
             )
 
-    def test_all_extraction_methods(self, ledger, gmp_hash, previous_hash):
-        for method in ["MolecularDistillation", "Winterization", "SupercriticalCO2"]:
-            receipt = create_processing_receipt(
-                facility_id="FAC-01",
-                facility_name="Test",
-                gmp_cert_type="NSF",
-                gmp_cert_id="X",
-                gmp_cert_hash=gmp_hash,
-                batch_id=f"BP-{method}",
-                extraction_method=method,
-                extraction_temp_c=240.0,
-                yield_input_kg=1000.0,
-                yield_output_kg=150.0,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
-            )
-            assert receipt["extraction_method"] == method
+    @pytest.mark.parametrize("method", ["MolecularDistillation", "Winterization", "SupercriticalCO2"])
+    def test_all_extraction_methods(self, ledger, gmp_hash, previous_hash, method):
+        kwargs = BASE_PROCESSING | dict(
+            batch_id=f"BP-{method}", extraction_method=method, yield_output_kg=150.0,
+        )
+        receipt = create_processing_receipt(
+            **kwargs, gmp_cert_hash=gmp_hash, previous_hash=previous_hash, ledger_path=ledger,
+        )
+        assert receipt["extraction_method"] == method
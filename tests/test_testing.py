@@ -1,7 +1,5 @@
 """Tests for Stage 3: Testing Receipt."""
 
-import os
-import tempfile
 import pytest
 
 from src.core import dual_hash, StopRule
@@ -15,56 +13,48 @@ from src.testing import (
 )
 
 
-@pytest.fixture
-def ledger():
-    path = tempfile.mktemp(suffix=".jsonl")
-    yield path
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
+# create_testing_receipt arguments shared by the receipt tests; each test
+# overrides only what it exercises and passes hashes and ledger itself
+BASE_TESTING = dict(
+    lab_name="Lab",
+    lab_cert_type="ISO17025",
+    lab_cert_id="ISO-001",
+    batch_id="BP-TEST",
+    mercury_ppm=0.02,
+    pcbs_ppm=0.03,
+    dioxins_pg_per_g=1.2,
+    epa_mg=420,
+    dha_mg=300,
+    label_claim_mg=700,
+    peroxide_meq_per_kg=3.0,
+    anisidine=10.0,
+)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def lab_hash():
     return dual_hash(b"test_lab_cert.pdf")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def previous_hash():
     return dual_hash(b"previous_processing_receipt")
 
 
 class TestValidateContaminants:
-    def test_all_pass(self):
-        result = validate_contaminants(0.02, 0.03, 1.2)
-        assert result["all_pass"] is True
-        assert result["mercury_pass"] is True
-        assert result["pcbs_pass"] is True
-        assert result["dioxins_pass"] is True
-
-    def test_mercury_fail(self):
-        result = validate_contaminants(0.15, 0.03, 1.2)
-        assert result["all_pass"] is False
-        assert result["mercury_pass"] is False
-
-    def test_pcbs_fail(self):
-        result = validate_contaminants(0.02, 0.10, 1.2)
-        assert result["all_pass"] is False
-        assert result["pcbs_pass"] is False
-
-    def test_dioxins_fail(self):
-        result = validate_contaminants(0.02, 0.03, 3.5)
-        assert result["all_pass"] is False
-        assert result["dioxins_pass"] is False
-
-    def test_all_fail(self):
-        result = validate_contaminants(0.15, 0.10, 3.5)
-        assert result["all_pass"] is False
-
-    def test_at_limit_pass(self):
-        result = validate_contaminants(0.1, 0.09, 3.0)
-        assert result["all_pass"] is True
+    @pytest.mark.parametrize("mercury,pcbs,dioxins,expected", [
+        (0.02, 0.03, 1.2, (True, True, True, True)),     # all pass
+        (0.15, 0.03, 1.2, (False, True, True, False)),   # mercury fail
+        (0.02, 0.10, 1.2, (True, False, True, False)),   # pcbs fail
+        (0.02, 0.03, 3.5, (True, True, False, False)),   # dioxins fail
+        (0.15, 0.10, 3.5, (False, False, False, False)), # all fail
+        (0.1, 0.09, 3.0, (True, True, True, True)),      # at limit
+    ])
+    def test_contaminant_limits(self, mercury, pcbs, dioxins, expected):
+        result = validate_contaminants(mercury, pcbs, dioxins)
+        assert (
+            result["mercury_pass"], result["pcbs_pass"], result["dioxins_pass"], result["all_pass"]
+        ) == expected
 
 
 class TestValidatePotency:
@@ -89,47 +79,24 @@ class TestValidatePotency:
 
 
 class TestValidateOxidation:
-    def test_pass(self):
-        result = validate_oxidation(3.8, 10.7)
-        assert result["oxidation_pass"] is True
-        assert result["totox"] == pytest.approx(18.3, abs=0.1)
-
-    def test_totox_calculation(self):
-        result = validate_oxidation(5.0, 16.0)
-        assert result["totox"] == 26.0  # 2*5 + 16
-
-    def test_fail_peroxide(self):
-        result = validate_oxidation(6.0, 10.0)
-        assert result["oxidation_pass"] is False
-
-    def test_fail_anisidine(self):
-        result = validate_oxidation(3.0, 21.0)
-        assert result["oxidation_pass"] is False
-
-    def test_fail_totox(self):
-        result = validate_oxidation(5.0, 17.0)
-        assert result["oxidation_pass"] is False
-        assert result["totox"] == 27.0
+    @pytest.mark.parametrize("peroxide,anisidine,expected_totox,expected_pass", [
+        (3.8, 10.7, 18.3, True),
+        (5.0, 16.0, 26.0, True),   # 2*5 + 16
+        (6.0, 10.0, 22.0, False),  # peroxide fail
+        (3.0, 21.0, 27.0, False),  # anisidine fail
+        (5.0, 17.0, 27.0, False),  # totox fail
+    ])
+    def test_oxidation_limits(self, peroxide, anisidine, expected_totox, expected_pass):
+        result = validate_oxidation(peroxide, anisidine)
+        assert result["totox"] == expected_totox
+        assert result["oxidation_pass"] is expected_pass
 
 
 class TestCreateTestingReceipt:
     def test_passing_receipt(self, ledger, lab_hash, previous_hash):
+        kwargs = BASE_TESTING | dict(lab_name="Eurofins", peroxide_meq_per_kg=3.8, anisidine=10.7)
         receipt = create_testing_receipt(
-            lab_name="Eurofins",
-            lab_cert_type="ISO17025",
-            lab_cert_id="ISO-001",
-            lab_cert_hash=lab_hash,
-            batch_id="BP-TEST",
-            mercury_ppm=0.02,
-            pcbs_ppm=0.03,
-            dioxins_pg_per_g=1.2,
-            epa_mg=420,
-            dha_mg=300,
-            label_claim_mg=700,
-            peroxide_meq_per_kg=3.8,
-            anisidine=10.7,
-            previous_hash=previous_hash,
-            ledger_path=ledger,
+            **kwargs, lab_cert_hash=lab_hash, previous_hash=previous_hash, ledger_path=ledger,
         )
         assert receipt["receipt_type"] == "testing"
         assert receipt["overall_pass"] is True
@@ -138,103 +105,42 @@ class TestCreateTestingReceipt:
         assert receipt["oxidation"]["oxidation_pass"] is True
 
     def test_contaminant_exceed_raises(self, ledger, lab_hash, previous_hash):
+        kwargs = BASE_TESTING | dict(
+            batch_id="BP-FAIL", mercury_ppm=0.15, peroxide_meq_per_kg=3.8, anisidine=10.7,
+        )
         with pytest.raises(StopRule, match="CONTAMINANT_EXCEED"):
             create_testing_receipt(
-                lab_name="Lab",
-                lab_cert_type="ISO17025",
-                lab_cert_id="ISO-001",
-                lab_cert_hash=lab_hash,
-                batch_id="BP-FAIL",
-                mercury_ppm=0.15,
-                pcbs_ppm=0.03,
-                dioxins_pg_per_g=1.2,
-                epa_mg=420,
-                dha_mg=300,
-                label_claim_mg=700,
-                peroxide_meq_per_kg=3.8,
-                anisidine=10.7,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
+                **kwargs, lab_cert_hash=lab_hash, previous_hash=previous_hash, ledger_path=ledger,
             )
 
     def test_totox_exceed_raises(self, ledger, lab_hash, previous_hash):
+        kwargs = BASE_TESTING | dict(batch_id="BP-RANCID", peroxide_meq_per_kg=5.0, anisidine=17.0)
         with pytest.raises(StopRule, match="TOTOX_EXCEED"):
             create_testing_receipt(
-                lab_name="Lab",
-                lab_cert_type="ISO17025",
-                lab_cert_id="ISO-001",
-                lab_cert_hash=lab_hash,
-                batch_id="BP-RANCID",
-                mercury_ppm=0.02,
-                pcbs_ppm=0.03,
-                dioxins_pg_per_g=1.2,
-                epa_mg=420,
-                dha_mg=300,
-                label_claim_mg=700,
-                peroxide_meq_per_kg=5.0,
-                anisidine=17.0,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
+                **kwargs, lab_cert_hash=lab_hash, previous_hash=previous_hash, ledger_path=ledger,
             )
 
-    def test_invalid_lab_cert_type_raises(self, ledger, lab_hash, previous_hash):
+    def test_invalid_lab_cert_type_raises(self, null_ledger, lab_hash, previous_hash):
+        kwargs = BASE_TESTING | dict(lab_cert_type="INVALID", lab_cert_id="X")
         with pytest.raises(StopRule, match="Invalid lab cert type"):
             create_testing_receipt(
-                lab_name="Lab",
-                lab_cert_type="INVALID",
-                lab_cert_id="X",
-                lab_cert_hash=lab_hash,
-                batch_id="BP-TEST",
-                mercury_ppm=0.02,
-                pcbs_ppm=0.03,
-                dioxins_pg_per_g=1.2,
-                epa_mg=420,
-                dha_mg=300,
-                label_claim_mg=700,
-                peroxide_meq_per_kg=3.0,
-                anisidine=10.0,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
+                **kwargs, lab_cert_hash=lab_hash, previous_hash=previous_hash,
+                ledger_path=null_ledger,
             )
 
-    def test_bad_lab_hash_format_raises(self, ledger, previous_hash):
+    def test_bad_lab_hash_format_raises(self, null_ledger, previous_hash):
+        kwargs = BASE_TESTING | dict(lab_cert_id="X")
         with pytest.raises(StopRule, match="dual-hash format"):
             create_testing_receipt(
-                lab_name="Lab",
-                lab_cert_type="ISO17025",
-                lab_cert_id="X",
-                lab_cert_hash="not_dual_hash",
-                batch_id="BP-TEST",
-                mercury_ppm=0.02,
-                pcbs_ppm=0.03,
-                dioxins_pg_per_g=1.2,
-                epa_mg=420,
-                dha_mg=300,
-                label_claim_mg=700,
-                peroxide_meq_per_kg=3.0,
-                anisidine=10.0,
-                previous_hash=previous_hash,
-                ledger_path=ledger,
+                **kwargs, lab_cert_hash="not_dual_hash", previous_hash=previous_hash,
+                ledger_path=null_ledger,
             )
 
     def test_label_fraud_receipt_emitted(self, ledger, lab_hash, previous_hash):
         """When potency fails but contaminants pass, receipt should still emit."""
+        kwargs = BASE_TESTING | dict(batch_id="BP-LABEL", epa_mg=300, dha_mg=200)
         receipt = create_testing_receipt(
-            lab_name="Lab",
-            lab_cert_type="ISO17025",
-            lab_cert_id="ISO-001",
-            lab_cert_hash=lab_hash,
-            batch_id="BP-LABEL",
-            mercury_ppm=0.02,
-            pcbs_ppm=0.03,
-            dioxins_pg_per_g=1.2,
-            epa_mg=300,
-            dha_mg=200,
-            label_claim_mg=700,
-            peroxide_meq_per_kg=3.0,
-            anisidine=10.0,
-            previous_hash=previous_hash,
-            ledger_path=ledger,
+            **kwargs, lab_cert_hash=lab_hash, previous_hash=previous_hash, ledger_path=ledger,
         )
         assert receipt["overall_pass"] is False
         assert receipt["potency"]["potency_pass"] is False